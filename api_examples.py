@@ -7,10 +7,28 @@ This file shows practical examples of using the new API integrations:
 3. Kupiapi library for kupi.cz discounts
 """
 
+import os
+import sys
+
+try:
+    from foodler.scrapers import (
+        OpenFoodFactsAPI, NutritionScraper, KupiScraper, get_usda_client
+    )
+    _import_error = None
+except ImportError as e:
+    _import_error = e
+
+
+def _require_scrapers():
+    """Re-raise the scrapers import error, if any, for the running example."""
+    if _import_error is not None:
+        raise _import_error
+
+
 # Example 1: Basic nutrition lookup using Open Food Facts
 def example_openfoodfacts_basic():
     """Basic usage of Open Food Facts API."""
-    from foodler.scrapers import OpenFoodFactsAPI
+    _require_scrapers()
     
     print("=== Example 1: Open Food Facts - Basic Nutrition Lookup ===\n")
     
@@ -40,7 +58,7 @@ def example_openfoodfacts_basic():
 # Example 2: Barcode scanning with Open Food Facts
 def example_openfoodfacts_barcode():
     """Demonstrate barcode lookup."""
-    from foodler.scrapers import OpenFoodFactsAPI
+    _require_scrapers()
     
     print("=== Example 2: Open Food Facts - Barcode Lookup ===\n")
     
@@ -67,7 +85,7 @@ def example_openfoodfacts_barcode():
 # Example 3: Detailed nutrition info with vitamins and minerals
 def example_openfoodfacts_detailed():
     """Get detailed nutritional information."""
-    from foodler.scrapers import OpenFoodFactsAPI
+    _require_scrapers()
     
     print("=== Example 3: Open Food Facts - Detailed Nutrition ===\n")
     
@@ -100,8 +118,7 @@ def example_openfoodfacts_detailed():
 # Example 4: Using USDA FoodData Central API
 def example_usda_api():
     """Demonstrate USDA API usage (requires API key)."""
-    from foodler.scrapers import USDAFoodDataAPI
-    import os
+    _require_scrapers()
     
     print("=== Example 4: USDA FoodData Central API ===\n")
     
@@ -114,7 +131,7 @@ def example_usda_api():
         print("Set it with: export USDA_API_KEY='your-key-here'")
         return
     
-    api = USDAFoodDataAPI(api_key)
+    api = get_usda_client(api_key)
     
     # Search for a food
     food_name = "chicken breast"
@@ -135,9 +152,8 @@ def example_usda_api():
 
 # Example 5: Multi-source nutrition lookup
 def example_multi_source():
-    """Use NutritionScraper with multiple sources."""
-    from foodler.scrapers import NutritionScraper
-    import os
+    """Use NutritionScraper with multiple sources, looking up foods concurrently."""
+    _require_scrapers()
     
     print("=== Example 5: Multi-Source Nutrition Lookup ===\n")
     
@@ -145,12 +161,12 @@ def example_multi_source():
     usda_key = os.environ.get('USDA_API_KEY')
     scraper = NutritionScraper(usda_api_key=usda_key, country_code='cz')
     
-    # Search for foods
+    # Search for all foods at once
     foods_to_search = ["kuřecí prsa", "brambory", "mrkev"]
+    results = scraper.get_nutrition_info_batch(foods_to_search)
     
-    for food in foods_to_search:
+    for food, nutrition in zip(foods_to_search, results):
         print(f"Searching for: {food}")
-        nutrition = scraper.get_nutrition_info(food)
         
         if nutrition:
             print(f"  Found: {nutrition['name']}")
@@ -164,7 +180,7 @@ def example_multi_source():
 # Example 6: Search for products
 def example_search_products():
     """Search for multiple products."""
-    from foodler.scrapers import NutritionScraper
+    _require_scrapers()
     
     print("=== Example 6: Search Products ===\n")
     
@@ -183,7 +199,7 @@ def example_search_products():
 # Example 7: Kupi.cz discounts using kupiapi
 def example_kupi_discounts():
     """Get discounts from kupi.cz using kupiapi library."""
-    from foodler.scrapers import KupiScraper
+    _require_scrapers()
     
     print("=== Example 7: Kupi.cz Discounts ===\n")
     
@@ -212,7 +228,7 @@ def example_kupi_discounts():
 # Example 8: Search specific product discounts
 def example_kupi_search():
     """Search for specific product discounts."""
-    from foodler.scrapers import KupiScraper
+    _require_scrapers()
     
     print("=== Example 8: Kupi.cz - Search Product Discounts ===\n")
     
@@ -242,8 +258,8 @@ def example_kupi_search():
 
 # Example 9: Get discounts by store
 def example_kupi_by_store():
-    """Get discounts from specific stores."""
-    from foodler.scrapers import KupiScraper
+    """Get discounts from specific stores, fetching all stores concurrently."""
+    _require_scrapers()
     
     print("=== Example 9: Kupi.cz - Discounts by Store ===\n")
     
@@ -251,10 +267,10 @@ def example_kupi_by_store():
         scraper = KupiScraper()
         
         stores = ['tesco', 'lidl', 'kaufland']
+        results = scraper.get_discounts_by_shops(stores)
         
-        for store in stores:
+        for store, discounts in results.items():
             print(f"\n{store.upper()} Discounts:")
-            discounts = scraper.get_discounts_by_shop(store)
             print(f"  Found {len(discounts)} discounts")
             
             if discounts:
@@ -272,7 +288,7 @@ def example_kupi_by_store():
 # Example 10: Get best deals
 def example_best_deals():
     """Find the best current deals."""
-    from foodler.scrapers import KupiScraper
+    _require_scrapers()
     
     print("=== Example 10: Kupi.cz - Best Deals ===\n")
     
@@ -299,8 +315,6 @@ def example_best_deals():
 # Main function to run all examples
 def main():
     """Run all examples."""
-    import sys
-    
     examples = {
         '1': ('Open Food Facts - Basic', example_openfoodfacts_basic),
         '2': ('Open Food Facts - Barcode', example_openfoodfacts_barcode),
@@ -15,35 +15,14 @@ def main():
     
     # 2. Add some items
     print("   Adding items to fridge...")
-    db.add_item(
-        name="Chicken breast",
-        quantity=600,
-        unit="g",
-        calories=165,
-        protein=31,
-        carbs=0,
-        fats=3.6
-    )
-    
-    db.add_item(
-        name="Brown rice",
-        quantity=1000,
-        unit="g",
-        calories=370,
-        protein=7.9,
-        carbs=77,
-        fats=2.9
-    )
-    
-    db.add_item(
-        name="Broccoli",
-        quantity=400,
-        unit="g",
-        calories=34,
-        protein=2.8,
-        carbs=7,
-        fats=0.4
-    )
+    db.add_items([
+        {'name': "Chicken breast", 'quantity': 600, 'unit': "g",
+         'calories': 165, 'protein': 31, 'carbs': 0, 'fats': 3.6},
+        {'name': "Brown rice", 'quantity': 1000, 'unit': "g",
+         'calories': 370, 'protein': 7.9, 'carbs': 77, 'fats': 2.9},
+        {'name': "Broccoli", 'quantity': 400, 'unit': "g",
+         'calories': 34, 'protein': 2.8, 'carbs': 7, 'fats': 0.4},
+    ])
     
     # 3. List all items
     print("\n2. Current inventory:")
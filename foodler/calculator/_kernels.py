@@ -0,0 +1,70 @@
+"""Compiled numeric kernels for the nutrition calculator.
+
+Numba is optional. When it is not installed, an equivalent NumPy
+implementation is used instead.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# float32 constants keep the kernel arithmetic in single precision;
+# a float64 literal would promote every product to double
+_PER_100G = np.float32(0.01)
+_HUNDRED = np.float32(100)
+
+
+def _grade(nutri2d, qty, daily_needs, tol, target):
+    """Total a meal, convert to percentages of daily needs and check balance.
+
+    All arrays must be C-contiguous float32 (see GRADE_SIGNATURE).
+
+    Args:
+        nutri2d: (N, K) array of nutritional values per 100g
+        qty: N quantities in grams
+        daily_needs: K daily needs in the same column order as nutri2d
+        tol: Acceptable deviation from target in percentage points
+        target: Target percentage of daily needs per meal
+
+    Returns:
+        Tuple of (totals, percentages, is_balanced)
+    """
+    n, k = nutri2d.shape
+    totals = np.zeros(k, dtype=np.float32)
+    for i in range(n):
+        factor = qty[i] * _PER_100G
+        for j in range(k):
+            totals[j] += nutri2d[i, j] * factor
+
+    percentages = np.empty(k, dtype=np.float32)
+    for j in range(k):
+        percentages[j] = totals[j] / daily_needs[j] * _HUNDRED
+
+    for j in range(k):
+        if not (target - tol <= percentages[j] <= target + tol):
+            return totals, percentages, False
+    return totals, percentages, True
+
+
+# Explicit signature: compiled at import (and cached on disk) rather than
+# on the first call, and pins the inputs to C-contiguous float32 arrays
+GRADE_SIGNATURE = (
+    'Tuple((float32[::1], float32[::1], boolean))'
+    '(float32[:, ::1], float32[::1], float32[::1], float32, float32)'
+)
+
+if NUMBA_AVAILABLE:
+    grade = njit(GRADE_SIGNATURE, cache=True, fastmath=True)(_grade)
+else:
+    def grade(nutri2d, qty, daily_needs, tol, target):
+        """NumPy fallback for the compiled grading kernel (see _grade)."""
+        totals = nutri2d.T @ (qty * _PER_100G)
+        percentages = totals / daily_needs * _HUNDRED
+        is_balanced = bool(np.all(
+            (target - tol <= percentages) & (percentages <= target + tol)
+        ))
+        return totals, percentages, is_balanced
@@ -1,8 +1,117 @@
 """Nutrition calculator for balanced food intake."""
 
-from typing import Dict, List, Optional, Any
+import heapq
+from collections import Counter, OrderedDict, defaultdict
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 
+try:
+    import numpy as np
+    from ._kernels import grade
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Nutrients tracked per meal, in the column order of the nutrient matrix
+NUTRIENTS = ('calories', 'protein', 'carbs', 'fats')
+_CAL, _PRO, _CAR, _FAT = range(len(NUTRIENTS))
+
+BALANCE_CACHE_SIZE = 1024  # Meals remembered by calculate_meal_balance
+
+MEAL_TARGET = 33.33      # Percent of daily needs per meal, for 3 meals a day
+BALANCE_TOLERANCE = 15   # Acceptable deviation in percentage points
+
+# Activity multipliers (read-only)
+ACTIVITY_MULTIPLIERS = MappingProxyType({
+    'sedentary': 1.2,      # Little or no exercise
+    'light': 1.375,        # Light exercise 1-3 days/week
+    'moderate': 1.55,      # Moderate exercise 3-5 days/week
+    'active': 1.725,       # Hard exercise 6-7 days/week
+    'very_active': 1.9     # Very hard exercise & physical job
+})
+
+# Keys of the personalized needs, in the order returned by _compute_needs
+_NEEDS_KEYS = ('calories', 'protein', 'carbs', 'fats', 'fiber')
+
+
+@lru_cache(maxsize=256)
+def _compute_needs(age: int, weight: float, height: float,
+                   gender: str, activity_level: str) -> Tuple[float, ...]:
+    """Compute personalized daily needs in _NEEDS_KEYS order.
+    
+    Pure function of its inputs, so results are memoized. `gender` and
+    `activity_level` must already be lowercase.
+    """
+    # Calculate Basal Metabolic Rate (BMR) using Harris-Benedict equation
+    if gender == 'male':
+        bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
+    else:
+        bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
+    
+    multiplier = ACTIVITY_MULTIPLIERS.get(activity_level, 1.2)
+    daily_calories = bmr * multiplier
+    
+    # Calculate macronutrient needs
+    # Protein: 15-20% of calories (4 cal/g)
+    # Carbs: 45-65% of calories (4 cal/g)
+    # Fats: 20-35% of calories (9 cal/g)
+    
+    return (
+        round(daily_calories, 2),
+        round((daily_calories * 0.175) / 4, 2),  # 17.5% of calories
+        round((daily_calories * 0.55) / 4, 2),   # 55% of calories
+        round((daily_calories * 0.275) / 9, 2),  # 27.5% of calories
+        25 if gender == 'female' else 38         # Recommended daily fiber
+    )
+
+
+def _make_key(foods: List[Dict[str, Any]]) -> frozenset:
+    """Build an order-independent key identifying a meal.
+    
+    Identical foods listed twice are counted, so they still produce a
+    different key than the food listed once.
+    """
+    return frozenset(Counter(
+        (food.get('name'), food.get('quantity', 0),
+         food.get('calories', 0), food.get('protein', 0),
+         food.get('carbs', 0), food.get('fats', 0))
+        for food in foods
+    ).items())
+
+
+def _percent_and_check(totals: List[float], inv_needs: Tuple[float, ...],
+                       target: float = MEAL_TARGET,
+                       tolerance: float = BALANCE_TOLERANCE,
+                       early_exit: bool = False):
+    """Convert meal totals to percentages of daily needs and check balance.
+    
+    Nutrients are checked in NUTRIENTS order, calories first since they
+    usually deviate the most.
+    
+    Args:
+        totals: Meal totals in NUTRIENTS order
+        inv_needs: Reciprocals of the daily needs in NUTRIENTS order
+        target: Target percentage of daily needs per meal
+        tolerance: Acceptable deviation in percentage points
+        early_exit: Stop at the first nutrient out of tolerance
+        
+    Returns:
+        Tuple of (percentages, is_balanced). With early_exit, percentages
+        is None when the meal is not balanced.
+    """
+    percentages = {}
+    is_balanced = True
+    for nutrient, total, inv_need in zip(NUTRIENTS, totals, inv_needs):
+        percent = round(total * inv_need * 100, 2)
+        if not (target - tolerance <= percent <= target + tolerance):
+            if early_exit:
+                return None, False
+            is_balanced = False
+        percentages[nutrient] = percent
+    return percentages, is_balanced
+
 
 class NutritionCalculator:
     """Calculates balanced food intake based on nutritional needs."""
@@ -23,7 +132,26 @@ class NutritionCalculator:
             daily_needs: Dictionary of daily nutritional requirements.
                         If None, uses DEFAULT_DAILY_NEEDS
         """
-        self.daily_needs = daily_needs or self.DEFAULT_DAILY_NEEDS.copy()
+        self._balance_cache = OrderedDict()
+        self._needs_values = None
+        self.daily_needs = daily_needs or dict(self.DEFAULT_DAILY_NEEDS)
+    
+    def _refresh_needs(self) -> Tuple[float, ...]:
+        """Return the current needs in NUTRIENTS order, updating derived vectors.
+        
+        daily_needs may be modified in place, so the values are read on
+        every call; the reciprocals and the NumPy vector are only rebuilt
+        when they changed. Missing or zero needs count as 1.
+        """
+        needs = self.daily_needs
+        values = tuple(needs.get(nutrient) or 1 for nutrient in NUTRIENTS)
+        if values != self._needs_values:
+            self._needs_values = values
+            # Reciprocals turn the per-nutrient division into a multiplication
+            self._inv_needs = tuple(1.0 / value for value in values)
+            if NUMPY_AVAILABLE:
+                self._daily_needs_arr = np.array(values, dtype=np.float32)
+        return values
     
     def set_custom_needs(self, age: int, weight: float, height: float, 
                         gender: str, activity_level: str) -> Dict[str, float]:
@@ -41,40 +169,13 @@ class NutritionCalculator:
         Returns:
             Dictionary of calculated daily needs
         """
-        # Calculate Basal Metabolic Rate (BMR) using Harris-Benedict equation
-        if gender.lower() == 'male':
-            bmr = 88.362 + (13.397 * weight) + (4.799 * height) - (5.677 * age)
-        else:
-            bmr = 447.593 + (9.247 * weight) + (3.098 * height) - (4.330 * age)
-        
-        # Activity multipliers
-        activity_multipliers = {
-            'sedentary': 1.2,      # Little or no exercise
-            'light': 1.375,        # Light exercise 1-3 days/week
-            'moderate': 1.55,      # Moderate exercise 3-5 days/week
-            'active': 1.725,       # Hard exercise 6-7 days/week
-            'very_active': 1.9     # Very hard exercise & physical job
-        }
-        
-        multiplier = activity_multipliers.get(activity_level.lower(), 1.2)
-        daily_calories = bmr * multiplier
-        
-        # Calculate macronutrient needs
-        # Protein: 15-20% of calories (4 cal/g)
-        # Carbs: 45-65% of calories (4 cal/g)
-        # Fats: 20-35% of calories (9 cal/g)
-        
-        self.daily_needs = {
-            'calories': round(daily_calories, 2),
-            'protein': round((daily_calories * 0.175) / 4, 2),  # 17.5% of calories
-            'carbs': round((daily_calories * 0.55) / 4, 2),     # 55% of calories
-            'fats': round((daily_calories * 0.275) / 9, 2),     # 27.5% of calories
-            'fiber': 25 if gender.lower() == 'female' else 38   # Recommended daily fiber
-        }
+        needs = _compute_needs(age, weight, height,
+                               gender.lower(), activity_level.lower())
+        self.daily_needs = dict(zip(_NEEDS_KEYS, needs))
         
         return self.daily_needs
     
-    def calculate_meal_balance(self, foods: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def calculate_meal_balance(self, foods, quantities=None) -> Dict[str, Any]:
         """Calculate nutritional balance of a meal.
         
         Args:
@@ -82,54 +183,158 @@ class NutritionCalculator:
                   - name: Food name
                   - quantity: Amount (in grams or specified unit)
                   - calories, protein, carbs, fats: Nutritional values per 100g
+                  Alternatively, a pre-built (N, 4) array of per-100g values
+                  in NUTRIENTS column order, together with `quantities`.
+                  Pass C-contiguous float32 arrays to avoid a conversion
+                  copy; the compiled kernel only accepts that layout.
+            quantities: Array of N quantities when `foods` is an array
                   
         Returns:
             Dictionary with total nutrition and percentage of daily needs
         """
-        totals = {
-            'calories': 0,
-            'protein': 0,
-            'carbs': 0,
-            'fats': 0
-        }
+        # Arrays are graded directly; food lists are memoized per meal
+        if quantities is not None:
+            return self._calculate_meal_balance(foods, quantities)
         
-        for food in foods:
-            quantity = food.get('quantity', 0)
-            # Assume nutritional values are per 100g
-            factor = quantity / 100
-            
-            for nutrient in totals.keys():
-                totals[nutrient] += food.get(nutrient, 0) * factor
+        try:
+            key = (_make_key(foods), self._refresh_needs())
+        except TypeError:
+            # Unhashable values, grade without caching
+            return self._calculate_meal_balance(foods)
         
-        # Calculate percentage of daily needs
-        percentages = {
-            nutrient: round((totals[nutrient] / self.daily_needs.get(nutrient, 1)) * 100, 2)
-            for nutrient in totals.keys()
+        result = self._balance_cache.get(key)
+        if result is None:
+            result = self._calculate_meal_balance(foods)
+            self._balance_cache[key] = result
+            if len(self._balance_cache) > BALANCE_CACHE_SIZE:
+                self._balance_cache.popitem(last=False)
+        else:
+            self._balance_cache.move_to_end(key)
+        
+        # Copies, so callers can't modify the cached result
+        return {
+            'totals': dict(result['totals']),
+            'percentages': dict(result['percentages']),
+            'daily_needs': dict(self.daily_needs),
+            'is_balanced': result['is_balanced']
         }
+    
+    def _calculate_meal_balance(self, foods, quantities=None) -> Dict[str, Any]:
+        """Calculate nutritional balance of a meal without caching."""
+        self._refresh_needs()
+        if NUMPY_AVAILABLE:
+            totals_arr, percentages_arr, is_balanced = self._grade(foods, quantities)
+            
+            # float32 carries ~7 significant digits; round at the boundary
+            # so callers get plain floats without single-precision noise
+            totals = {
+                nutrient: round(total, 2)
+                for nutrient, total in zip(NUTRIENTS, totals_arr.tolist())
+            }
+            percentages = {
+                nutrient: round(percent, 2)
+                for nutrient, percent in zip(NUTRIENTS, percentages_arr.tolist())
+            }
+        else:
+            t = self._sum_totals(foods)
+            totals = {nutrient: round(total, 2) for nutrient, total in zip(NUTRIENTS, t)}
+            percentages, is_balanced = _percent_and_check(t, self._inv_needs)
         
         return {
             'totals': totals,
             'percentages': percentages,
-            'daily_needs': self.daily_needs,
-            'is_balanced': self._is_balanced(percentages)
+            'daily_needs': dict(self.daily_needs),
+            'is_balanced': bool(is_balanced)
         }
     
-    def _is_balanced(self, percentages: Dict[str, float], 
-                     tolerance: float = 15) -> bool:
-        """Check if a meal is balanced within tolerance.
+    def is_meal_balanced(self, foods, quantities=None) -> bool:
+        """Check whether a meal is balanced without building the full report.
+        
+        Cheaper than calculate_meal_balance when grading many candidate
+        meals: the check stops at the first nutrient out of tolerance.
+        
+        Args:
+            foods: Foods as accepted by calculate_meal_balance
+            quantities: Quantities when `foods` is an array
+            
+        Returns:
+            True if every nutrient is within tolerance of the per-meal target
+        """
+        self._refresh_needs()
+        if NUMPY_AVAILABLE:
+            return bool(self._grade(foods, quantities)[2])
+        
+        _, is_balanced = _percent_and_check(
+            self._sum_totals(foods), self._inv_needs, early_exit=True
+        )
+        return is_balanced
+    
+    def _grade(self, foods, quantities=None):
+        """Run the grading kernel on foods (see calculate_meal_balance).
+        
+        Returns:
+            Tuple of (totals, percentages, is_balanced) as NumPy values
+        """
+        if quantities is None:
+            nutri, qty = self._to_arrays(foods)
+        else:
+            nutri, qty = foods, quantities
+        
+        # Totals, percentages and the balance check in one fused kernel
+        return grade(
+            np.ascontiguousarray(nutri, dtype=np.float32).reshape(-1, len(NUTRIENTS)),
+            np.ascontiguousarray(qty, dtype=np.float32),
+            self._daily_needs_arr,
+            np.float32(BALANCE_TOLERANCE),
+            np.float32(MEAL_TARGET)
+        )
+    
+    @staticmethod
+    def _sum_totals(foods: List[Dict[str, Any]]) -> List[float]:
+        """Sum nutrient totals of foods in pure Python.
+        
+        Returns:
+            Totals in NUTRIENTS order
+        """
+        # Positional accumulators, unrolled over the four nutrients
+        t = [0.0, 0.0, 0.0, 0.0]
+        
+        for food in foods:
+            quantity = food.get('quantity', 0)
+            # Assume nutritional values are per 100g
+            factor = quantity * 0.01
+            
+            t[_CAL] += food.get('calories', 0) * factor
+            t[_PRO] += food.get('protein', 0) * factor
+            t[_CAR] += food.get('carbs', 0) * factor
+            t[_FAT] += food.get('fats', 0) * factor
+        
+        return t
+    
+    @staticmethod
+    def _to_arrays(foods: List[Dict[str, Any]]):
+        """Convert food dictionaries to a nutrient matrix and quantity vector.
         
         Args:
-            percentages: Dictionary of nutrient percentages
-            tolerance: Acceptable deviation percentage
+            foods: List of food dictionaries (see calculate_meal_balance)
             
         Returns:
-            True if all nutrients are within 100 ± tolerance percent
+            Tuple of (N, 4) per-100g nutrient matrix and N quantities
         """
-        target = 33.33  # For 3 meals a day
-        return all(
-            target - tolerance <= percent <= target + tolerance
-            for percent in percentages.values()
+        qty = np.fromiter(
+            (food.get('quantity', 0) for food in foods),
+            dtype=np.float32, count=len(foods)
         )
+        # One tuple per food in NUTRIENTS order, without an inner loop
+        nutri = np.array(
+            [
+                (food.get('calories', 0), food.get('protein', 0),
+                 food.get('carbs', 0), food.get('fats', 0))
+                for food in foods
+            ],
+            dtype=np.float32
+        ).reshape(-1, len(NUTRIENTS))
+        return nutri, qty
     
     def suggest_foods_to_balance(self, current_intake: Dict[str, float],
                                 foods_available: List[Dict]) -> List[Dict]:
@@ -145,40 +350,42 @@ class NutritionCalculator:
         suggestions = []
         
         # Calculate deficits
+        needs = self.daily_needs
+        intake_get = current_intake.get
         deficits = {
-            nutrient: max(0, self.daily_needs[nutrient] - current_intake.get(nutrient, 0))
-            for nutrient in self.daily_needs.keys()
+            nutrient: max(0, need - intake_get(nutrient, 0))
+            for nutrient, need in needs.items()
         }
         
         # Find the most deficient nutrient
         if not deficits or max(deficits.values()) == 0:
             return suggestions  # Already balanced
         
-        primary_deficit = max(deficits.items(), key=lambda x: x[1])[0]
+        primary_deficit = max(deficits, key=deficits.get)
+        needed = deficits[primary_deficit]
         
-        # Rank available foods by their content of the deficient nutrient
-        ranked_foods = sorted(
-            foods_available,
-            key=lambda f: f.get(primary_deficit, 0),
-            reverse=True
+        # Pick the top foods by their content of the deficient nutrient,
+        # skipping foods that don't contain it at all
+        ranked_foods = heapq.nlargest(
+            3,
+            (food for food in foods_available if food.get(primary_deficit, 0) > 0),
+            key=lambda f: f.get(primary_deficit, 0)
         )
         
         # Suggest top foods
-        for food in ranked_foods[:3]:
-            if food.get(primary_deficit, 0) > 0:
-                # Calculate suggested quantity
-                needed = deficits[primary_deficit]
-                content_per_100g = food.get(primary_deficit, 1)
-                suggested_quantity = (needed / content_per_100g) * 100
-                
-                suggestions.append({
-                    'name': food.get('name'),
-                    'suggested_quantity': round(suggested_quantity, 2),
-                    'reason': f'High in {primary_deficit}',
-                    'provides': {
-                        primary_deficit: content_per_100g
-                    }
-                })
+        for food in ranked_foods:
+            # Calculate suggested quantity
+            content_per_100g = food.get(primary_deficit, 1)
+            suggested_quantity = (needed / content_per_100g) * 100
+            
+            suggestions.append({
+                'name': food.get('name'),
+                'suggested_quantity': round(suggested_quantity, 2),
+                'reason': f'High in {primary_deficit}',
+                'provides': {
+                    primary_deficit: content_per_100g
+                }
+            })
         
         return suggestions
     
@@ -194,7 +401,7 @@ class NutritionCalculator:
             List of items to buy with quantities
         """
         shopping_list = []
-        needed_items = {}
+        needed_items = defaultdict(float)
         
         # Calculate total needed quantities
         for meal in meal_plan:
@@ -203,20 +410,18 @@ class NutritionCalculator:
                 quantity = ingredient.get('quantity', 0)
                 unit = ingredient.get('unit', 'g')
                 
-                key = f"{name}_{unit}"
-                needed_items[key] = needed_items.get(key, 0) + quantity
+                needed_items[(name, unit)] += quantity
         
         # Check against fridge inventory
         inventory_dict = {
-            f"{item.get('name')}_{item.get('unit')}": item.get('quantity', 0)
+            (item.get('name'), item.get('unit')): item.get('quantity', 0)
             for item in fridge_inventory
         }
         
         # Calculate what needs to be bought
-        for key, needed_qty in needed_items.items():
-            available_qty = inventory_dict.get(key, 0)
+        for (name, unit), needed_qty in needed_items.items():
+            available_qty = inventory_dict.get((name, unit), 0)
             if needed_qty > available_qty:
-                name, unit = key.rsplit('_', 1)
                 shopping_list.append({
                     'name': name,
                     'quantity': needed_qty - available_qty,
@@ -1,10 +1,11 @@
 """Command-line interface for Foodler application."""
 
 import click
+import csv
 from datetime import datetime
-from foodler.database import FridgeDatabase
-from foodler.scrapers import KupiScraper, NutritionScraper
-from foodler.calculator import NutritionCalculator
+
+# Database, scraper and calculator modules are imported inside the commands
+# that use them, so each command (and --help) only loads what it needs.
 
 
 @click.group()
@@ -34,62 +35,102 @@ def fridge():
 @click.option('--fats', type=float, help='Fats per unit')
 def fridge_add(name, quantity, unit, calories, protein, carbs, fats):
     """Add item to fridge inventory."""
-    db = FridgeDatabase()
+    from foodler.database import FridgeDatabase
+    
+    with FridgeDatabase() as db:
+        item = db.add_item(
+            name=name,
+            quantity=quantity,
+            unit=unit,
+            calories=calories,
+            protein=protein,
+            carbs=carbs,
+            fats=fats
+        )
+        
+        click.echo(f"Added: {item.name} ({item.quantity} {item.unit})")
+
+
+@fridge.command('import')
+@click.argument('csv_file', type=click.Path(exists=True, dir_okay=False))
+def fridge_import(csv_file):
+    """Add items to fridge inventory from a CSV file.
     
-    item = db.add_item(
-        name=name,
-        quantity=quantity,
-        unit=unit,
-        calories=calories,
-        protein=protein,
-        carbs=carbs,
-        fats=fats
-    )
+    The file needs name, quantity and unit columns; calories, protein,
+    carbs and fats columns are optional. All rows are added at once.
+    """
+    from foodler.database import FridgeDatabase
+    
+    items = []
+    # utf-8-sig drops the BOM Excel writes at the start of UTF-8 CSV files
+    with open(csv_file, newline='', encoding='utf-8-sig') as f:
+        # Line 1 is the header
+        for line_number, row in enumerate(csv.DictReader(f), 2):
+            try:
+                item = {
+                    'name': row['name'].strip(),
+                    'quantity': float(row['quantity']),
+                    'unit': row['unit'].strip()
+                }
+                for nutrient in ('calories', 'protein', 'carbs', 'fats'):
+                    value = (row.get(nutrient) or '').strip()
+                    item[nutrient] = float(value) if value else None
+            except (KeyError, AttributeError, ValueError) as e:
+                raise click.ClickException(f"Invalid row on line {line_number}: {e}")
+            items.append(item)
     
-    click.echo(f"Added: {item.name} ({item.quantity} {item.unit})")
-    db.close()
+    with FridgeDatabase() as db:
+        count = db.add_items(items)
+        click.echo(f"Imported {count} items")
 
 
 @fridge.command('list')
 def fridge_list():
     """List all items in fridge."""
-    db = FridgeDatabase()
-    items = db.get_all_items()
+    from foodler.database import FridgeDatabase, format_last_used
+    
+    with FridgeDatabase() as db:
+        items = db.get_all_items_lite()
     
     if not items:
         click.echo("Fridge is empty!")
         return
     
     click.echo("\n=== Fridge Inventory ===\n")
+    # Collect all lines and write them at once instead of echoing per line
+    lines = []
     for item in items:
-        click.echo(f"[{item.id}] {item.name}: {item.quantity} {item.unit}")
-        click.echo(f"    Last used: {item.last_used_meal} | Meals without: {item.meals_without}")
+        last_used = format_last_used(item.last_used_meal_date, item.last_used_meal_number)
+        lines.append(f"[{item.id}] {item.name}: {item.quantity} {item.unit}")
+        lines.append(f"    Last used: {last_used} | Meals without: {item.meals_without}")
         if item.calories:
-            click.echo(f"    Nutrition: {item.calories} kcal, "
-                      f"P: {item.protein}g, C: {item.carbs}g, F: {item.fats}g")
-        click.echo()
-    
-    db.close()
+            lines.append(f"    Nutrition: {item.calories} kcal, "
+                         f"P: {item.protein}g, C: {item.carbs}g, F: {item.fats}g")
+        lines.append("")
+    click.echo("\n".join(lines))
 
 
 @fridge.command('cycle')
 @click.option('--limit', default=10, help='Number of items to show')
 def fridge_cycle(limit):
     """Show items that should be used soon to cycle through inventory."""
-    db = FridgeDatabase()
-    items = db.get_items_to_use(limit)
+    from foodler.database import FridgeDatabase, format_last_used
+    
+    with FridgeDatabase() as db:
+        items = db.get_items_to_use_lite(limit)
     
     if not items:
         click.echo("No items in fridge!")
         return
     
     click.echo(f"\n=== Items to Use Next (Cycling Priority) ===\n")
+    lines = []
     for item in items:
-        click.echo(f"[{item.id}] {item.name}: {item.quantity} {item.unit}")
-        click.echo(f"    Last used: {item.last_used_meal} | Meals without: {item.meals_without}")
-        click.echo()
-    
-    db.close()
+        last_used = format_last_used(item.last_used_meal_date, item.last_used_meal_number)
+        lines.append(f"[{item.id}] {item.name}: {item.quantity} {item.unit}")
+        lines.append(f"    Last used: {last_used} | Meals without: {item.meals_without}")
+        lines.append("")
+    click.echo("\n".join(lines))
 
 
 @fridge.command('used')
@@ -97,34 +138,32 @@ def fridge_cycle(limit):
 @click.option('--meal', type=int, default=1, help='Meal number (1=Breakfast, 2=Lunch, 3=Dinner, 4=Snack)')
 def fridge_used(item_id, meal):
     """Mark an item as used in a meal."""
-    db = FridgeDatabase()
-    
-    meal_names = {1: "Breakfast", 2: "Lunch", 3: "Dinner", 4: "Snack"}
-    meal_name = meal_names.get(meal, f"Meal {meal}")
-    
-    item = db.mark_as_used(item_id, meal)
-    if item:
-        click.echo(f"Marked {item.name} as used in {meal_name}!")
-        click.echo(f"Last used meal: {item.last_used_meal}")
-        click.echo(f"Meals without reset to 0.")
-    else:
-        click.echo(f"Item {item_id} not found")
+    from foodler.database import FridgeDatabase
     
-    db.close()
+    with FridgeDatabase() as db:
+        meal_names = {1: "Breakfast", 2: "Lunch", 3: "Dinner", 4: "Snack"}
+        meal_name = meal_names.get(meal, f"Meal {meal}")
+        
+        item = db.mark_as_used(item_id, meal)
+        if item:
+            click.echo(f"Marked {item.name} as used in {meal_name}!")
+            click.echo(f"Last used meal: {item.last_used_meal}")
+            click.echo(f"Meals without reset to 0.")
+        else:
+            click.echo(f"Item {item_id} not found")
 
 
 @fridge.command('remove')
 @click.argument('item_id', type=int)
 def fridge_remove(item_id):
     """Remove item from fridge."""
-    db = FridgeDatabase()
+    from foodler.database import FridgeDatabase
     
-    if db.delete_item(item_id):
-        click.echo(f"Removed item {item_id}")
-    else:
-        click.echo(f"Item {item_id} not found")
-    
-    db.close()
+    with FridgeDatabase() as db:
+        if db.delete_item(item_id):
+            click.echo(f"Removed item {item_id}")
+        else:
+            click.echo(f"Item {item_id} not found")
 
 
 @cli.group()
@@ -137,6 +176,8 @@ def discounts():
 @click.option('--limit', default=10, help='Number of discounts to show')
 def discounts_list(limit):
     """Show current food discounts."""
+    from foodler.scrapers import KupiScraper
+    
     scraper = KupiScraper()
     deals = scraper.get_best_deals(limit=limit)
     
@@ -157,6 +198,8 @@ def discounts_list(limit):
 @click.argument('product')
 def discounts_search(product):
     """Search for product discounts."""
+    from foodler.scrapers import KupiScraper
+    
     scraper = KupiScraper()
     results = scraper.search_product(product)
     
@@ -182,6 +225,8 @@ def nutrition():
 @click.argument('food_name')
 def nutrition_lookup(food_name):
     """Look up nutritional values for a food."""
+    from foodler.scrapers import NutritionScraper
+    
     scraper = NutritionScraper()
     info = scraper.get_nutrition_info(food_name)
     
@@ -217,6 +262,8 @@ def calculate():
               help='Activity level')
 def calculate_needs(age, weight, height, gender, activity):
     """Calculate personalized daily nutritional needs."""
+    from foodler.calculator import NutritionCalculator
+    
     calculator = NutritionCalculator()
     needs = calculator.set_custom_needs(age, weight, height, gender, activity)
     
@@ -231,60 +278,67 @@ def calculate_needs(age, weight, height, gender, activity):
 @calculate.command('meal')
 def calculate_meal():
     """Calculate nutritional balance of foods from fridge."""
-    db = FridgeDatabase()
-    items = db.get_all_items()
-    
-    if not items:
-        click.echo("Fridge is empty! Add items first.")
-        db.close()
-        return
-    
-    click.echo("\n=== Available Items ===\n")
-    for i, item in enumerate(items, 1):
-        click.echo(f"{i}. {item.name} ({item.quantity} {item.unit})")
-    
-    selection = click.prompt("\nSelect items for your meal (comma-separated numbers)", type=str)
+    from foodler.calculator import NutritionCalculator
+    from foodler.database import FridgeDatabase
     
-    try:
-        indices = [int(x.strip()) - 1 for x in selection.split(',')]
-        selected_items = [items[i] for i in indices if 0 <= i < len(items)]
-    except (ValueError, IndexError):
-        click.echo("Invalid selection")
-        db.close()
-        return
-    
-    # Get quantities
-    foods = []
-    for item in selected_items:
+    with FridgeDatabase() as db:
+        items = db.get_all_items()
+        
+        if not items:
+            click.echo("Fridge is empty! Add items first.")
+            return
+        
+        click.echo("\n=== Available Items ===\n")
+        for i, item in enumerate(items, 1):
+            click.echo(f"{i}. {item.name} ({item.quantity} {item.unit})")
+        
+        selection = click.prompt("\nSelect items for your meal (comma-separated numbers)", type=str)
+        
         try:
-            qty = click.prompt(f"\nHow much {item.name} (in grams)?", type=float)
-            foods.append({
-                'name': item.name,
-                'quantity': qty,
-                'calories': item.calories or 0,
-                'protein': item.protein or 0,
-                'carbs': item.carbs or 0,
-                'fats': item.fats or 0
-            })
-        except (ValueError, click.Abort):
-            click.echo(f"Invalid quantity, skipping {item.name}")
-    
-    if foods:
-        calculator = NutritionCalculator()
-        balance = calculator.calculate_meal_balance(foods)
+            indices = [int(x.strip()) - 1 for x in selection.split(',')]
+            selected_items = [items[i] for i in indices if 0 <= i < len(items)]
+        except (ValueError, IndexError):
+            click.echo("Invalid selection")
+            return
         
-        click.echo("\n=== Meal Analysis ===\n")
-        click.echo("Total Nutrition:")
-        for nutrient, value in balance['totals'].items():
-            percentage = balance['percentages'][nutrient]
-            click.echo(f"  {nutrient.capitalize()}: {value:.2f} ({percentage:.1f}% of daily needs)")
+        # Get quantities
+        foods = []
+        used_ids = []
+        for item in selected_items:
+            try:
+                qty = click.prompt(f"\nHow much {item.name} (in grams)?", type=float)
+                used_ids.append(item.id)
+                foods.append({
+                    'name': item.name,
+                    'quantity': qty,
+                    'calories': item.calories or 0,
+                    'protein': item.protein or 0,
+                    'carbs': item.carbs or 0,
+                    'fats': item.fats or 0
+                })
+            except (ValueError, click.Abort):
+                click.echo(f"Invalid quantity, skipping {item.name}")
         
-        if balance['is_balanced']:
-            click.echo("\n✓ This meal is well balanced!")
-        else:
-            click.echo("\n⚠ This meal could be better balanced")
-    
-    db.close()
+        if foods:
+            calculator = NutritionCalculator()
+            balance = calculator.calculate_meal_balance(foods)
+            
+            click.echo("\n=== Meal Analysis ===\n")
+            click.echo("Total Nutrition:")
+            for nutrient, value in balance['totals'].items():
+                percentage = balance['percentages'][nutrient]
+                click.echo(f"  {nutrient.capitalize()}: {value:.2f} ({percentage:.1f}% of daily needs)")
+            
+            if balance['is_balanced']:
+                click.echo("\n✓ This meal is well balanced!")
+            else:
+                click.echo("\n⚠ This meal could be better balanced")
+            
+            if click.confirm("\nMark these items as used?", default=False):
+                meal = click.prompt("Meal number (1=Breakfast, 2=Lunch, 3=Dinner, 4=Snack)",
+                                    type=int, default=1)
+                count = db.mark_many_as_used(used_ids, meal)
+                click.echo(f"Marked {count} items as used.")
 
 
 if __name__ == '__main__':
@@ -1,5 +1,5 @@
 """Database module for managing fridge inventory."""
 
-from .fridge_db import FridgeDatabase
+from .fridge_db import FridgeDatabase, format_last_used
 
-__all__ = ["FridgeDatabase"]
+__all__ = ["FridgeDatabase", "format_last_used"]
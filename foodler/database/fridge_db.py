@@ -1,12 +1,51 @@
 """Fridge inventory database management."""
 
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, Date
+from sqlalchemy import create_engine, event, insert, select, text, update, Column, Index, Integer, String, Float, DateTime, Date
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import declarative_base, sessionmaker
+from contextlib import contextmanager
+import atexit
+from functools import lru_cache
+import os
 from datetime import datetime, timezone, date
 
 Base = declarative_base()
 
 
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Configure each new SQLite connection for cheaper commits and reads.
+    
+    WAL avoids rewriting a rollback journal on every commit and, with
+    synchronous=NORMAL, only syncs to disk at checkpoints. A 20 MB page
+    cache, in-memory temp tables and a 256 MB memory map keep hot reads
+    out of the filesystem.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA cache_size=-20000")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+def format_last_used(meal_date, meal_number):
+    """Format the last used meal date and number for display.
+    
+    Args:
+        meal_date: Date the item was last used, or None
+        meal_number: Meal number (1=Breakfast, 2=Lunch, 3=Dinner, 4=Snack)
+        
+    Returns:
+        String like '2024-01-31 Lunch', or 'Never used'
+    """
+    if meal_date and meal_number:
+        meal_names = {1: "Breakfast", 2: "Lunch", 3: "Dinner", 4: "Snack"}
+        meal_name = meal_names.get(meal_number, f"Meal {meal_number}")
+        return f"{meal_date.strftime('%Y-%m-%d')} {meal_name}"
+    return "Never used"
+
+
 class FoodItem(Base):
     """Model for food items in the fridge."""
     
@@ -25,21 +64,160 @@ class FoodItem(Base):
     fats = Column(Float)
     added_date = Column(DateTime, default=lambda: datetime.now(timezone.utc))
     
+    __table_args__ = (
+        # Matches the ORDER BY of get_items_to_use, so it reads the index in
+        # order. The trailing columns (plus the implicit rowid) cover
+        # get_items_to_use_lite, which is answered from the index alone.
+        Index('ix_food_cycle_cover', meals_without.desc(),
+              last_used_meal_date, last_used_meal_number, name, quantity, unit),
+        Index('ix_food_name', name),
+    )
+    
     def __repr__(self):
         return f"<FoodItem(name='{self.name}', quantity={self.quantity} {self.unit})>"
     
     @property
     def last_used_meal(self):
         """Get combined last used meal info as string."""
-        if self.last_used_meal_date and self.last_used_meal_number:
-            meal_names = {1: "Breakfast", 2: "Lunch", 3: "Dinner", 4: "Snack"}
-            meal_name = meal_names.get(self.last_used_meal_number, f"Meal {self.last_used_meal_number}")
-            return f"{self.last_used_meal_date.strftime('%Y-%m-%d')} {meal_name}"
-        return "Never used"
+        return format_last_used(self.last_used_meal_date, self.last_used_meal_number)
+
+
+# Columns read by display-only queries, which skip building ORM objects
+_SUMMARY_COLUMNS = (
+    FoodItem.id, FoodItem.name, FoodItem.quantity, FoodItem.unit,
+    FoodItem.last_used_meal_date, FoodItem.last_used_meal_number,
+    FoodItem.meals_without, FoodItem.calories, FoodItem.protein,
+    FoodItem.carbs, FoodItem.fats
+)
+
+# Columns shown for the usage cycle, all stored in ix_food_cycle_cover
+_CYCLE_COLUMNS = (
+    FoodItem.id, FoodItem.name, FoodItem.quantity, FoodItem.unit,
+    FoodItem.last_used_meal_date, FoodItem.last_used_meal_number,
+    FoodItem.meals_without
+)
+
+# Usage-cycle ordering, served by the ix_food_cycle_cover index. Ties are
+# broken by name, the next index column, so both listings agree.
+_CYCLE_ORDER = (
+    FoodItem.meals_without.desc(),
+    FoodItem.last_used_meal_date.asc().nullsfirst(),
+    FoodItem.last_used_meal_number.asc().nullsfirst(),
+    FoodItem.name.asc()
+)
+
+
+def _create_indexes(engine):
+    """Add indexes missing from databases created by older versions.
+    
+    create_all() skips tables that already exist, including their
+    indexes. Statistics are gathered once so the query planner
+    considers the new indexes.
+    """
+    for index in FoodItem.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    
+    with engine.begin() as connection:
+        has_stats = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        )).first()
+        if not has_stats:
+            connection.execute(text("ANALYZE"))
+
+
+# External-content full-text index over food_items.name, kept in sync by
+# triggers. The trigram tokenizer matches any substring of 3+ characters,
+# like the LIKE '%name%' search it replaces.
+_FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE food_items_fts USING fts5("
+    "name, content='food_items', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER food_items_fts_insert AFTER INSERT ON food_items BEGIN "
+    "INSERT INTO food_items_fts(rowid, name) VALUES (new.id, new.name); END",
+    "CREATE TRIGGER food_items_fts_delete AFTER DELETE ON food_items BEGIN "
+    "INSERT INTO food_items_fts(food_items_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    "CREATE TRIGGER food_items_fts_update AFTER UPDATE OF name ON food_items BEGIN "
+    "INSERT INTO food_items_fts(food_items_fts, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    "INSERT INTO food_items_fts(rowid, name) VALUES (new.id, new.name); END",
+    # Index rows that existed before the table was created
+    "INSERT INTO food_items_fts(food_items_fts) VALUES ('rebuild')",
+)
+
+
+def _create_fts(engine):
+    """Create the full-text name index if it doesn't exist yet.
+    
+    Returns:
+        True if the index is available, False if this SQLite build lacks
+        FTS5 or the trigram tokenizer (SQLite < 3.34)
+    """
+    with engine.connect() as connection:
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE name = 'food_items_fts'"
+        )).first()
+    if exists:
+        return True
+    
+    try:
+        with engine.begin() as connection:
+            for statement in _FTS_SCHEMA:
+                connection.execute(text(statement))
+    except OperationalError:
+        return False
+    return True
+
+
+def _get_session_factory(db_path):
+    """Return the engine and session factory for a database file.
+    
+    Cached per file, so the schema is only checked once per process no
+    matter how many FridgeDatabase instances are opened.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        
+    Returns:
+        Session factory bound to the database engine
+    """
+    # Resolved first, so a relative path opened after a chdir gets its own
+    # engine and schema check, and spellings of one file share an engine
+    return _create_session_factory(os.path.abspath(db_path))
+
+
+def _optimize_and_dispose(engine):
+    """Run PRAGMA optimize once, then close the engine's pooled connections.
+    
+    Registered to run at exit, once per engine, so SQLite can refresh the
+    query planner statistics it found useful during this process.
+    """
+    try:
+        with engine.begin() as connection:
+            connection.execute(text("PRAGMA optimize"))
+    except OperationalError:
+        # The database file may be gone by now; there is nothing to optimize
+        pass
+    engine.dispose()
+
+
+@lru_cache(maxsize=None)
+def _create_session_factory(db_path):
+    """Create the engine and session factory for an absolute database path."""
+    engine = create_engine(f'sqlite:///{db_path}')
+    event.listen(engine, 'connect', _set_sqlite_pragmas)
+    Base.metadata.create_all(engine)
+    _create_indexes(engine)
+    has_fts = _create_fts(engine)
+    atexit.register(_optimize_and_dispose, engine)
+    # Committed items stay readable without a SELECT per expired object
+    return sessionmaker(bind=engine, expire_on_commit=False, info={'fts': has_fts})
 
 
 class FridgeDatabase:
-    """Manages the fridge inventory database."""
+    """Manages the fridge inventory database.
+    
+    Can be used as a context manager, which closes the session on exit.
+    """
     
     def __init__(self, db_path='fridge.db'):
         """Initialize the database connection.
@@ -47,11 +225,26 @@ class FridgeDatabase:
         Args:
             db_path: Path to the SQLite database file
         """
-        self.engine = create_engine(f'sqlite:///{db_path}')
-        Base.metadata.create_all(self.engine)
-        Session = sessionmaker(bind=self.engine)
+        Session = _get_session_factory(db_path)
+        self.engine = Session.kw['bind']
         self.session = Session()
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    @contextmanager
+    def _transaction(self):
+        """Commit the changes made in the block, or roll back on error."""
+        try:
+            yield self.session
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+    
     def add_item(self, name, quantity, unit, 
                  calories=None, protein=None, carbs=None, fats=None):
         """Add a food item to the fridge inventory.
@@ -78,10 +271,42 @@ class FridgeDatabase:
             fats=fats,
             meals_without=0
         )
-        self.session.add(item)
-        self.session.commit()
+        with self._transaction():
+            self.session.add(item)
         return item
     
+    def add_items(self, items):
+        """Add several food items in a single transaction.
+        
+        Rows are inserted with one executemany statement and one commit,
+        which is much cheaper than calling add_item repeatedly.
+        
+        Args:
+            items: List of dictionaries with the add_item arguments
+                  (name, quantity, unit and optional calories, protein,
+                  carbs, fats)
+            
+        Returns:
+            Number of items added
+        """
+        rows = [
+            {
+                'name': item['name'],
+                'quantity': item['quantity'],
+                'unit': item['unit'],
+                'calories': item.get('calories'),
+                'protein': item.get('protein'),
+                'carbs': item.get('carbs'),
+                'fats': item.get('fats'),
+                'meals_without': 0
+            }
+            for item in items
+        ]
+        if rows:
+            with self._transaction():
+                self.session.execute(insert(FoodItem), rows)
+        return len(rows)
+    
     def get_all_items(self):
         """Get all items from the fridge inventory.
         
@@ -90,6 +315,18 @@ class FridgeDatabase:
         """
         return self.session.query(FoodItem).all()
     
+    def get_all_items_lite(self):
+        """Get all items as lightweight read-only rows.
+        
+        Cheaper than get_all_items for display, as no ORM objects are built.
+        
+        Returns:
+            List of rows with id, name, quantity, unit, last_used_meal_date,
+            last_used_meal_number, meals_without, calories, protein, carbs
+            and fats attributes
+        """
+        return self.session.execute(select(*_SUMMARY_COLUMNS)).all()
+    
     def get_item_by_name(self, name):
         """Get food items by name.
         
@@ -99,6 +336,14 @@ class FridgeDatabase:
         Returns:
             List of matching FoodItem objects
         """
+        # The trigram index needs at least 3 characters to match on
+        if self.session.info.get('fts') and len(name) >= 3:
+            phrase = '"' + name.replace('"', '""') + '"'
+            matches = text(
+                "SELECT rowid FROM food_items_fts WHERE food_items_fts MATCH :phrase"
+            ).bindparams(phrase=phrase)
+            return self.session.query(FoodItem).filter(FoodItem.id.in_(matches)).all()
+        
         return self.session.query(FoodItem).filter(FoodItem.name.like(f'%{name}%')).all()
     
     def update_quantity(self, item_id, new_quantity):
@@ -111,10 +356,10 @@ class FridgeDatabase:
         Returns:
             The updated FoodItem object or None if not found
         """
-        item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
-        if item:
-            item.quantity = new_quantity
-            self.session.commit()
+        with self._transaction():
+            item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
+            if item:
+                item.quantity = new_quantity
         return item
     
     def delete_item(self, item_id):
@@ -126,12 +371,11 @@ class FridgeDatabase:
         Returns:
             True if deleted, False if not found
         """
-        item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
-        if item:
-            self.session.delete(item)
-            self.session.commit()
-            return True
-        return False
+        with self._transaction():
+            item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
+            if item:
+                self.session.delete(item)
+        return item is not None
     
     def get_items_to_use(self, limit=10):
         """Get items that should be used soon based on last usage.
@@ -140,6 +384,7 @@ class FridgeDatabase:
         1. Number of meals without using it (descending)
         2. Last used meal date (oldest first, never used items first)
         3. Last used meal number (earlier meals first)
+        4. Name, for items tied on all of the above
         
         Args:
             limit: Maximum number of items to return
@@ -147,11 +392,24 @@ class FridgeDatabase:
         Returns:
             List of FoodItem objects that should be used soon
         """
-        return self.session.query(FoodItem).order_by(
-            FoodItem.meals_without.desc(),
-            FoodItem.last_used_meal_date.asc().nullsfirst(),
-            FoodItem.last_used_meal_number.asc().nullsfirst()
-        ).limit(limit).all()
+        return self.session.query(FoodItem).order_by(*_CYCLE_ORDER).limit(limit).all()
+    
+    def get_items_to_use_lite(self, limit=10):
+        """Get items that should be used soon as lightweight read-only rows.
+        
+        Same ordering as get_items_to_use. Only the columns stored in the
+        covering index are read, so SQLite never touches the table itself.
+        
+        Args:
+            limit: Maximum number of items to return
+            
+        Returns:
+            List of rows with id, name, quantity, unit, last_used_meal_date,
+            last_used_meal_number and meals_without attributes
+        """
+        return self.session.execute(
+            select(*_CYCLE_COLUMNS).order_by(*_CYCLE_ORDER).limit(limit)
+        ).all()
     
     def mark_as_used(self, item_id, meal_number=None):
         """Mark an item as used in a meal.
@@ -167,34 +425,65 @@ class FridgeDatabase:
         Returns:
             The updated FoodItem object or None if not found
         """
-        item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
-        if item:
-            item.last_used_meal_date = date.today()
-            item.last_used_meal_number = meal_number if meal_number is not None else 1
-            item.meals_without = 0
-            self.session.commit()
+        with self._transaction():
+            item = self.session.query(FoodItem).filter(FoodItem.id == item_id).first()
+            if item:
+                item.last_used_meal_date = date.today()
+                item.last_used_meal_number = meal_number if meal_number is not None else 1
+                item.meals_without = 0
         return item
     
+    def mark_many_as_used(self, item_ids, meal_number=None):
+        """Mark several items as used in the same meal.
+        
+        Same as calling mark_as_used for each item, but runs as a single
+        UPDATE statement with one commit.
+        
+        Args:
+            item_ids: IDs of the items that were used
+            meal_number: Meal number (1=Breakfast, 2=Lunch, 3=Dinner, 4=Snack, etc.)
+                        If None, defaults to 1 (Breakfast)
+            
+        Returns:
+            Number of items updated
+        """
+        if not item_ids:
+            return 0
+        
+        stmt = update(FoodItem).where(FoodItem.id.in_(item_ids)).values(
+            last_used_meal_date=date.today(),
+            last_used_meal_number=meal_number if meal_number is not None else 1,
+            meals_without=0
+        )
+        with self._transaction():
+            result = self.session.execute(
+                stmt, execution_options={'synchronize_session': 'evaluate'}
+            )
+        return result.rowcount
+    
     def increment_meals_without(self, exclude_ids=None):
         """Increment meals_without counter for all items except the ones used.
         
         Call this after preparing a meal to track which items weren't used.
+        Runs as a single UPDATE statement instead of loading every item.
         
         Args:
             exclude_ids: List of item IDs that were used in this meal
         """
-        if exclude_ids is None:
-            exclude_ids = []
+        stmt = update(FoodItem).values(meals_without=FoodItem.meals_without + 1)
+        if exclude_ids:
+            stmt = stmt.where(FoodItem.id.not_in(exclude_ids))
         
-        items = self.session.query(FoodItem).filter(
-            ~FoodItem.id.in_(exclude_ids) if exclude_ids else True
-        ).all()
-        
-        for item in items:
-            item.meals_without += 1
-        
-        self.session.commit()
+        # Commits don't expire loaded items, so update their counters in
+        # Python rather than reloading them
+        with self._transaction():
+            self.session.execute(stmt, execution_options={'synchronize_session': 'evaluate'})
     
     def close(self):
-        """Close the database session."""
+        """Close the database session.
+        
+        Called automatically when the database is used as a context manager.
+        The connection goes back to the engine's pool; PRAGMA optimize runs
+        once per database when the process exits.
+        """
         self.session.close()
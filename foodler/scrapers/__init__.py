@@ -1,23 +1,36 @@
-"""Scrapers module for fetching data from external sources."""
-
-from .kupi_scraper import KupiScraper
-from .nutrition_scraper import NutritionScraper
-from .openfoodfacts_api import OpenFoodFactsAPI
-from .kaloricketabulky_scraper import KalorickeTabulkyScraper
-
-try:
-    from .usda_api import USDAFoodDataAPI
-    __all__ = [
-        "KupiScraper", 
-        "NutritionScraper", 
-        "OpenFoodFactsAPI", 
-        "USDAFoodDataAPI",
-        "KalorickeTabulkyScraper"
-    ]
-except ImportError:
-    __all__ = [
-        "KupiScraper", 
-        "NutritionScraper", 
-        "OpenFoodFactsAPI",
-        "KalorickeTabulkyScraper"
-    ]
+"""Scrapers module for fetching data from external sources.
+
+Scraper classes are imported lazily on first access, so importing this
+package doesn't load every scraper and its HTTP/parsing dependencies.
+"""
+
+import importlib
+
+# Public name -> submodule defining it
+_LAZY = {
+    "KupiScraper": ".kupi_scraper",
+    "NutritionScraper": ".nutrition_scraper",
+    "OpenFoodFactsAPI": ".openfoodfacts_api",
+    "USDAFoodDataAPI": ".usda_api",
+    "AsyncUSDAFoodDataAPI": ".usda_api_async",
+    "KalorickeTabulkyScraper": ".kaloricketabulky_scraper",
+    "FoodNutrition": ".usda_api",
+    "get_usda_client": ".usda_api",
+    "get_kt_scraper": ".kaloricketabulky_scraper"
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
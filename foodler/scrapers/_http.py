@@ -0,0 +1,143 @@
+"""HTTP connection pooling and retries for the scraper sessions."""
+
+import asyncio
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Throttling and transient server errors worth retrying
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header.
+    
+    Args:
+        value: Header value, either delay seconds or an HTTP date
+        
+    Returns:
+        Non-negative delay in seconds, or None if the header is missing or
+        malformed
+    """
+    if not value:
+        return None
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+            delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return max(delay, 0.0)
+
+
+class TokenBucket:
+    """Client-side rate limiter allowing `rate` requests per second on average.
+    
+    Up to `capacity` requests may start back-to-back after an idle period.
+    Safe to share between threads.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        """Initialize the bucket full.
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = float(max(capacity, 1))
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self):
+        """Add the tokens accrued since the last refill. Hold the lock."""
+        now = time.monotonic()
+        self._tokens = min(self.capacity,
+                           self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+    
+    def _reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            self._refill()
+            # If the bucket is empty this reserves the next token, so
+            # waiters are served in order without holding the lock
+            self._tokens -= 1
+            return -self._tokens / self.rate if self._tokens < 0 else 0.0
+    
+    def set_rate(self, rate: float):
+        """Change the refill rate, keeping the tokens accrued at the old rate."""
+        with self._lock:
+            self._refill()
+            self.rate = rate
+    
+    def acquire(self):
+        """Block until a request may start."""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+    
+    async def acquire_async(self):
+        """Wait, without blocking the event loop, until a request may start."""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class JitteredRetry(Retry):
+    """Retry policy adding up to one second of random jitter to each backoff.
+    
+    Spreads out retries of clients that failed together, so they don't hit
+    the server again at the same moment. A Retry-After header on 429/503
+    responses still takes precedence.
+    """
+    
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return backoff + random.uniform(0, 1.0) if backoff else backoff
+
+
+def mount_pooled_adapter(session: requests.Session, pool_maxsize: int = 50,
+                         retries: int = 3, backoff_factor: float = 0.3,
+                         allowed_methods: Iterable[str] = ('GET',)) -> requests.Session:
+    """Mount a connection-pooling adapter on a session.
+    
+    Connections to each host are kept alive in a pool of up to
+    `pool_maxsize`, so repeated and concurrent requests reuse warm
+    TCP/TLS connections instead of handshaking again.
+    
+    Args:
+        session: Session to configure
+        pool_maxsize: Connections kept per host
+        retries: Retries of requests on connection errors, 429 and
+            transient 5xx responses, with jittered exponential backoff;
+            0 disables them (e.g. for clients with their own retry logic)
+        backoff_factor: Base of the exponential backoff in seconds
+        allowed_methods: HTTP methods that are retried; only add methods
+            the client uses for requests that are safe to repeat
+        
+    Returns:
+        The session, for chaining
+    """
+    max_retries = JitteredRetry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(allowed_methods),
+        raise_on_status=False
+    ) if retries else 0
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=pool_maxsize,
+                          max_retries=max_retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
@@ -0,0 +1,21 @@
+"""JSON encoding and decoding for the scrapers, using orjson when it is installed."""
+
+try:
+    import orjson
+    loads = orjson.loads
+    dumps = orjson.dumps
+
+    def dumps_indented(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes indented by two spaces."""
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    import json
+    loads = json.loads
+
+    def dumps(obj) -> bytes:
+        """Serialize obj to compact UTF-8 JSON bytes."""
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def dumps_indented(obj) -> bytes:
+        """Serialize obj to UTF-8 JSON bytes indented by two spaces."""
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
@@ -0,0 +1,302 @@
+"""Result caches for the nutrition API clients."""
+
+import copy
+import functools
+import inspect
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Calls of cached methods in progress, keyed by (id(cache), key), so
+# concurrent identical calls wait for the first instead of repeating it
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def normalize_key(text: str) -> str:
+    """Canonicalize text for use in a cache key.
+
+    Lowercases and collapses whitespace, so e.g. "Mléko ", "mléko" and
+    "MLÉKO" share one cache entry. Diacritics are kept: in Czech they
+    distinguish different words (e.g. "sýr" and "syr").
+    """
+    return _WHITESPACE_RE.sub(' ', text.strip().lower())
+
+
+class LRUCache:
+    """Thread-safe in-process cache evicting the least recently used entries."""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        """Initialize the cache.
+
+        Args:
+            maxsize: Maximum number of entries to keep
+            ttl: Seconds after which entries expire (None keeps them
+                until they are evicted)
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires is not None and expires <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        """Store value under key, evicting the oldest entry if full."""
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+class RedisCache:
+    """Redis-backed cache for sharing results between processes."""
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', ttl: int = 86400,
+                 prefix: str = 'foodler'):
+        """Initialize the cache.
+
+        Args:
+            url: Redis connection URL
+            ttl: Time to live of cached entries in seconds
+            prefix: Prefix for all keys written by this cache
+        """
+        if not REDIS_AVAILABLE:
+            raise ImportError(
+                "redis library is required. Install with: pip install redis"
+            )
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or error."""
+        try:
+            raw = self.client.get(f"{self.prefix}:{key}")
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache read failed for '{key}': {e}")
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key: str, value: Any):
+        """Store value under key with the configured TTL."""
+        try:
+            self.client.setex(f"{self.prefix}:{key}", self.ttl, json.dumps(value))
+        except redis.RedisError as e:
+            logger.warning(f"Redis cache write failed for '{key}': {e}")
+
+
+class SQLiteCache:
+    """SQLite-backed cache persisting results across runs and processes."""
+
+    def __init__(self, path: str, ttl: int = 7 * 86400):
+        """Initialize the cache, creating the database file if needed.
+
+        Args:
+            path: Path to the SQLite database file (`~` is expanded)
+            ttl: Time to live of cached entries in seconds
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        # sqlite3 connections can't be shared between threads
+        self._local = threading.local()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            # WAL lets readers in other processes proceed during writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss or error."""
+        try:
+            row = self._connection().execute(
+                "SELECT value FROM cache WHERE key = ? AND expires > ?",
+                (key, time.time())
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache read failed for '{key}': {e}")
+            return None
+        return json.loads(row[0]) if row is not None else None
+
+    def set(self, key: str, value: Any):
+        """Store value under key with the configured TTL."""
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), time.time() + self.ttl)
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"SQLite cache write failed for '{key}': {e}")
+
+    def clear_stale(self) -> int:
+        """Delete expired entries.
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._connection() as conn:
+            return conn.execute(
+                "DELETE FROM cache WHERE expires <= ?", (time.time(),)
+            ).rowcount
+
+
+class TieredCache:
+    """In-process cache backed by an optional shared cache (e.g. Redis).
+
+    Lookups check the in-process tier first; entries found in the shared
+    tier are promoted to the in-process tier.
+    """
+
+    def __init__(self, memory: Optional[LRUCache] = None, shared: Optional[Any] = None):
+        """Initialize the cache.
+
+        Args:
+            memory: In-process cache tier (a new LRUCache if None)
+            shared: Optional cache tier shared between processes (RedisCache
+                or SQLiteCache)
+        """
+        self.memory = memory if memory is not None else LRUCache()
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss."""
+        value = self.memory.get(key)
+        if value is None and self.shared is not None:
+            value = self.shared.get(key)
+            if value is not None:
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any):
+        """Store value under key in all tiers."""
+        self.memory.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+
+
+def cached(namespace: str) -> Callable:
+    """Cache the results of a client method in the client's `cache` attribute.
+
+    The cache key is built from `namespace` and the method arguments,
+    normalized with normalize_key(). Empty results (None or an
+    empty list, i.e. not found or request errors) are not cached. Clients
+    without a cache are called through directly.
+
+    Concurrent calls with the same key are coalesced: only the first one
+    runs the method, the others wait for its result. Every caller gets its
+    own copy of the result, so modifying it doesn't affect the cache.
+
+    Args:
+        namespace: Key prefix identifying the cached method
+    """
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            cache = getattr(self, 'cache', None)
+            if cache is None:
+                return method(self, *args, **kwargs)
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            parts = [
+                normalize_key(str(value)) if value is not None else ''
+                for name, value in bound.arguments.items() if name != 'self'
+            ]
+            key = ':'.join([namespace] + parts)
+
+            value = cache.get(key)
+            if value is not None:
+                return copy.deepcopy(value)
+
+            flight = (id(cache), key)
+            with _inflight_lock:
+                future = _inflight.get(flight)
+                leader = future is None
+                if leader:
+                    future = _inflight[flight] = Future()
+            if not leader:
+                return copy.deepcopy(future.result())
+
+            try:
+                value = method(self, *args, **kwargs)
+                # The cache and waiting callers share a copy, the caller
+                # keeps the original
+                shared = copy.deepcopy(value)
+                if value is not None and value != []:
+                    cache.set(key, shared)
+                future.set_result(shared)
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with _inflight_lock:
+                    del _inflight[flight]
+            return value
+
+        return wrapper
+
+    return decorator
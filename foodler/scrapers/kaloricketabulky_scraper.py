@@ -10,16 +10,207 @@ WARNING: This scraper may violate kaloricketabulky.cz Terms of Service.
 This implementation is based on jimrs/kaloricketabulky-scraper approach.
 """
 
+import asyncio
+import csv
+import gzip
 import requests
-from bs4 import BeautifulSoup
-from typing import Dict, List, Optional
+import lxml.etree
+import lxml.html
+from typing import Dict, List, Optional, Tuple
 import logging
+import random
+import re
+import threading
 import time
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from datetime import timedelta
 from urllib.parse import urljoin, quote
 
+from . import _json
+from ._http import TokenBucket, mount_pooled_adapter, parse_retry_after
+from .cache import LRUCache, TieredCache, cached, normalize_key
+
+try:
+    import requests_cache
+    REQUESTS_CACHE_AVAILABLE = True
+except ImportError:
+    REQUESTS_CACHE_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Nutrition table label keywords (Czech and English) per field, in the
+# order they take precedence when a label contains several of them
+_LABEL_KEYWORDS = (
+    ('calories', ('energie', 'kalorie')),
+    ('protein', ('bílkovin', 'protein')),
+    ('carbs', ('sacharid', 'carbohydrate')),
+    ('fats', ('tuk',)),
+    ('fiber', ('vláknina', 'fiber')),
+    ('sugars', ('cukr', 'sugar')),
+    ('salt', ('sůl', 'salt', 'sodík')),
+)
+
+# Keyword -> (precedence, field)
+_LABEL_FIELDS = {
+    keyword: (precedence, field)
+    for precedence, (field, keywords) in enumerate(_LABEL_KEYWORDS)
+    for keyword in keywords
+}
+
+# One scan per label finds every keyword it contains
+_LABEL_RE = re.compile('|'.join(re.escape(keyword) for keyword in _LABEL_FIELDS))
+
+_NUMBER_RE = re.compile(r'(\d+\.?\d*)')
+_FOOD_ID_RE = re.compile(r'/(?:food|potraviny)/(\d+)')
+_CHARSET_RE = re.compile(r'charset=["\']?([\w.:-]+)', re.IGNORECASE)
+
+# First and second cell of every table row that has at least two, as two
+# aligned lists, so a nutrition table is read with two XPath evaluations
+_ROWS_WITH_VALUE = './/tr[count(.//td | .//th) >= 2]'
+_LABEL_CELLS = lxml.etree.XPath(
+    _ROWS_WITH_VALUE + '/descendant::*[self::td or self::th][1]'
+)
+_VALUE_CELLS = lxml.etree.XPath(
+    _ROWS_WITH_VALUE + '/descendant::*[self::td or self::th][2]'
+)
+
+# Skip building nodes the scraper never reads (comments, processing
+# instructions, whitespace-only text) and the ID hash table
+_PARSER_OPTIONS = dict(
+    remove_comments=True,
+    remove_pis=True,
+    remove_blank_text=True,
+    collect_ids=False,
+)
+
+# Sessions shared by all scraper instances, keyed by HTTP cache name
+# (None for an uncached session)
+_SESSIONS: Dict[Optional[str], requests.Session] = {}
+_SESSIONS_LOCK = threading.Lock()
+
+
+def _shared_session(http_cache: Optional[str]) -> requests.Session:
+    """Return the module-wide session for an HTTP cache, creating it once.
+    
+    Short-lived scrapers (e.g. from scrape_kaloricketabulky) reuse its
+    kept-alive connections instead of opening new ones.
+    
+    Args:
+        http_cache: Name of the on-disk HTTP cache, or None for a plain session
+        
+    Returns:
+        Shared session
+    """
+    with _SESSIONS_LOCK:
+        session = _SESSIONS.get(http_cache)
+        if session is None:
+            if http_cache:
+                session = requests_cache.CachedSession(
+                    http_cache,
+                    backend='sqlite',
+                    use_cache_dir=True,
+                    expire_after=timedelta(hours=24),
+                    allowable_codes=(200,),
+                    allowable_methods=('GET',)
+                )
+            else:
+                session = requests.Session()
+            # Room for concurrent detail fetches to the same host;
+            # throttling is retried by _rate_limited_request instead
+            mount_pooled_adapter(session, pool_maxsize=20, retries=0)
+            session.headers.update({
+                'User-Agent': 'Foodler Research Project - Educational Use Only',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'cs,en;q=0.9',
+            })
+            _SESSIONS[http_cache] = session
+        return session
+
+
+def _open_export(filename: str, text: bool = False):
+    """Open an export file for writing, gzip-compressed if it ends in .gz."""
+    if filename.endswith('.gz'):
+        if text:
+            return gzip.open(filename, 'wt', compresslevel=3, encoding='utf-8', newline='')
+        return gzip.open(filename, 'wb', compresslevel=3)
+    if text:
+        return open(filename, 'w', encoding='utf-8', newline='', buffering=1 << 20)
+    return open(filename, 'wb', buffering=1 << 20)
+
+
+def _parse_html(response: requests.Response):
+    """Parse an HTML response into an lxml tree.
+    
+    When the Content-Type header names the charset, the body is streamed
+    straight into libxml2, which decodes it once while parsing. Otherwise
+    the page is decoded first with the same charset detection BeautifulSoup
+    uses, since libxml2 assumes Latin-1 for pages without a charset
+    declaration.
+    """
+    match = _CHARSET_RE.search(response.headers.get('Content-Type', ''))
+    if match:
+        try:
+            parser = lxml.html.HTMLParser(encoding=match.group(1), **_PARSER_OPTIONS)
+        except LookupError:
+            # Unknown charset name, let UnicodeDammit work it out
+            parser = None
+        if parser is not None:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                parser.feed(chunk)
+            return parser.close()
+    
+    # bs4 is only needed here, so don't pay its import time up front
+    from bs4.dammit import UnicodeDammit
+    
+    markup = UnicodeDammit(response.content, is_html=True).unicode_markup
+    # Re-encoded, since lxml rejects str input with an XML encoding
+    # declaration; the explicit encoding overrides any declared charset
+    parser = lxml.html.HTMLParser(encoding='utf-8', **_PARSER_OPTIONS)
+    return lxml.html.document_fromstring(markup.encode('utf-8'), parser=parser)
+
+
+def _selector_xpath(selector: str) -> str:
+    """Translate a simple 'tag', 'tag.class' or 'tag#id' selector to XPath.
+    
+    The XPath searches descendants of the context element, like
+    BeautifulSoup's find()/select_one().
+    """
+    if '#' in selector:
+        tag, _, element_id = selector.partition('#')
+        return f".//{tag or '*'}[@id='{element_id}']"
+    if '.' in selector:
+        tag, _, class_name = selector.partition('.')
+        return (f".//{tag or '*'}"
+                f"[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]")
+    return f".//{selector}"
+
+
+@lru_cache(maxsize=None)
+def _compile_selector(selector: str, first: bool = False) -> lxml.etree.XPath:
+    """Compile a simple selector to XPath once per selector.
+    
+    Args:
+        selector: Selector accepted by _selector_xpath
+        first: Match only the first descendant in document order
+        
+    Returns:
+        Compiled XPath, called with the context element
+    """
+    path = _selector_xpath(selector)
+    return lxml.etree.XPath(f"({path})[1]" if first else path)
+
+
+def _find_all(element, selector: str) -> list:
+    """Find all descendants of element matching a simple selector."""
+    return _compile_selector(selector)(element)
+
+
+def _find(element, selector: str):
+    """Find the first descendant of element matching a simple selector."""
+    found = _compile_selector(selector, first=True)(element)
+    return found[0] if found else None
+
 
 class KalorickeTabulkyScraper:
     """
@@ -31,21 +222,44 @@ class KalorickeTabulkyScraper:
     
     BASE_URL = "https://www.kaloricketabulky.cz"
     
-    def __init__(self, rate_limit_seconds: float = 1.0):
+    # Retries for throttled or temporarily unavailable responses
+    MAX_RETRIES = 5
+    RETRY_STATUSES = (429, 502, 503, 504)
+    BACKOFF_BASE = 1.0   # seconds, doubled on each retry
+    BACKOFF_CAP = 60.0   # seconds
+    
+    def __init__(self, rate_limit_seconds: float = 1.0, burst: int = 1,
+                 cache: bool = True, http_cache: Optional[str] = 'kaloricketabulky'):
         """
         Initialize the scraper.
         
         Args:
-            rate_limit_seconds: Delay between requests to avoid overwhelming server
+            rate_limit_seconds: Average delay between requests to avoid
+                overwhelming server
+            burst: Number of requests that may start back-to-back after an
+                idle period (token bucket capacity)
+            cache: Cache food details in memory (see `cache.hits`/`cache.misses`)
+                and remember queries that found nothing
+            http_cache: Name of an on-disk HTTP cache in the user cache
+                directory, kept for 24h. Requires requests-cache; None
+                disables it.
         """
         self.rate_limit = rate_limit_seconds
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Foodler Research Project - Educational Use Only',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-            'Accept-Language': 'cs,en;q=0.9',
-        })
-        self.last_request_time = 0
+        self._http_cached = bool(http_cache) and REQUESTS_CACHE_AVAILABLE
+        self.session = _shared_session(http_cache if self._http_cached else None)
+        # One token per request, refilled every `_interval` seconds up to
+        # `burst`. The interval starts at rate_limit, is doubled when the
+        # server throttles us and recovers gradually on success.
+        self._interval = rate_limit_seconds
+        self.rate_limiter = (
+            TokenBucket(1 / rate_limit_seconds, burst) if rate_limit_seconds > 0 else None
+        )
+        self._interval_lock = threading.Lock()
+        
+        self.cache = TieredCache(LRUCache(maxsize=4096)) if cache else None
+        # Normalized queries whose search page listed no foods, so repeated
+        # lookups of unknown foods skip the request
+        self.not_found = LRUCache(maxsize=10000) if cache else None
         
         logger.warning(
             "KalorickeTabulkyScraper: This may violate kaloricketabulky.cz ToS. "
@@ -53,20 +267,80 @@ class KalorickeTabulkyScraper:
         )
     
     def _rate_limited_request(self, url: str, params: Optional[Dict] = None) -> requests.Response:
-        """Make a rate-limited HTTP request."""
-        # Enforce rate limiting
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.rate_limit:
-            time.sleep(self.rate_limit - elapsed)
+        """Make a rate-limited HTTP request.
         
-        try:
-            response = self.session.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            self.last_request_time = time.time()
-            return response
-        except requests.RequestException as e:
-            logger.error(f"Request failed for {url}: {e}")
-            raise
+        Requests start at most one per `rate_limit` seconds on average,
+        with bursts of up to `burst` requests after idle periods. Requests
+        from several threads may be in flight at the same time.
+        
+        Throttled (429) and temporarily unavailable responses are retried
+        up to MAX_RETRIES times, honoring Retry-After or else backing off
+        exponentially with jitter. A 429 also halves the request rate until
+        requests succeed again.
+        
+        Pages already in the HTTP cache are returned without waiting for
+        the rate limiter. Bodies are streamed, so read them with
+        _parse_html() or iter_content().
+        """
+        if self._http_cached:
+            response = self.session.get(url, params=params, only_if_cached=True)
+            if response.status_code == 200:
+                return response
+        
+        for attempt in range(self.MAX_RETRIES + 1):
+            self._wait_for_rate_limit()
+            
+            try:
+                response = self.session.get(url, params=params, timeout=10, stream=True)
+                response.raise_for_status()
+                self._adjust_interval(throttled=False)
+                return response
+            except requests.HTTPError as e:
+                # Error bodies are never read, release the connection
+                e.response.close()
+                status = e.response.status_code
+                if status not in self.RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                    logger.error(f"Request failed for {url}: {e}")
+                    raise
+                
+                if status == 429:
+                    self._adjust_interval(throttled=True)
+                delay = self._retry_delay(e.response, attempt)
+                logger.warning(f"HTTP {status} for {url}, retrying in {delay:.1f}s")
+                time.sleep(delay)
+            except requests.RequestException as e:
+                logger.error(f"Request failed for {url}: {e}")
+                raise
+    
+    def _wait_for_rate_limit(self):
+        """Block until the rate limiter allows another request."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+    
+    def _adjust_interval(self, throttled: bool):
+        """Slow down after a 429 response and recover towards rate_limit."""
+        if self.rate_limiter is None:
+            return
+        
+        with self._interval_lock:
+            interval = self._interval
+            if throttled:
+                interval = min(max(interval, self.rate_limit) * 2, self.BACKOFF_CAP)
+            elif interval > self.rate_limit:
+                interval = max(self.rate_limit, interval * 0.9)
+            if interval != self._interval:
+                self._interval = interval
+                self.rate_limiter.set_rate(1 / interval)
+    
+    def _retry_delay(self, response: requests.Response, attempt: int) -> float:
+        """Seconds to wait before retrying a failed request."""
+        delay = parse_retry_after(response.headers.get('Retry-After'))
+        if delay is not None:
+            return min(delay, self.BACKOFF_CAP)
+        
+        # Full jitter keeps concurrent clients from retrying in lockstep
+        backoff = min(self.BACKOFF_CAP, self.BACKOFF_BASE * 2 ** attempt)
+        return random.uniform(0, backoff)
     
     def search_foods(self, query: str, limit: int = 20) -> List[Dict]:
         """
@@ -82,6 +356,11 @@ class KalorickeTabulkyScraper:
         Note: This is a placeholder implementation. Actual HTML structure
         needs to be inspected from kaloricketabulky.cz to complete.
         """
+        key = normalize_key(query)
+        if self.not_found is not None and self.not_found.get(key):
+            logger.debug(f"Skipping search for '{query}', nothing found before")
+            return []
+        
         try:
             # Note: This URL structure is hypothetical and needs verification
             search_url = urljoin(self.BASE_URL, f"/vyhledavani/{quote(query)}")
@@ -89,32 +368,30 @@ class KalorickeTabulkyScraper:
             logger.info(f"Searching for '{query}' on kaloricketabulky.cz")
             response = self._rate_limited_request(search_url)
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            tree = _parse_html(response)
             
             # Placeholder: Actual selectors need to be determined by inspecting the site
             # This is an example structure that would need to be adapted
             foods = []
             
             # Example: Find food items (actual class names need verification)
-            food_items = soup.find_all('div', class_='food-item', limit=limit)
+            food_items = _find_all(tree, 'div.food-item')[:limit]
             
             if not food_items:
                 # Try alternative selectors
-                food_items = soup.find_all('tr', class_='food-row', limit=limit)
+                food_items = _find_all(tree, 'tr.food-row')[:limit]
             
             for item in food_items:
-                try:
-                    food = self._parse_food_item(item)
-                    if food:
-                        foods.append(food)
-                except Exception as e:
-                    logger.warning(f"Failed to parse food item: {e}")
-                    continue
+                food = self._parse_food_item(item)
+                if food:
+                    foods.append(food)
             
             logger.info(f"Found {len(foods)} foods for query '{query}'")
+            if not foods and limit > 0 and self.not_found is not None:
+                self.not_found.set(key, True)
             return foods
             
-        except Exception as e:
+        except (requests.RequestException, lxml.etree.LxmlError) as e:
             logger.error(f"Search failed for '{query}': {e}")
             return []
     
@@ -125,24 +402,23 @@ class KalorickeTabulkyScraper:
         Note: This is a placeholder. Actual implementation needs to be
         based on real HTML structure from kaloricketabulky.cz
         """
-        try:
-            # Placeholder selectors - need to be verified against actual site
-            food = {
-                'name': self._safe_extract(item, 'h3', 'a', 'span.name'),
-                'food_id': self._extract_id(item),
-                'calories': self._safe_extract_number(item, 'span.calories', 'td.calories'),
-                'source': 'kaloricketabulky.cz'
-            }
-            
-            # Only return if we got at least a name
-            if food['name']:
-                return food
-            return None
-            
-        except Exception as e:
-            logger.debug(f"Failed to parse food item: {e}")
-            return None
+        # Placeholder selectors - need to be verified against actual site
+        food = {
+            'name': self._safe_extract(item, 'h3', 'a', 'span.name'),
+            'food_id': self._extract_id(item),
+            'calories': self._safe_extract_number(item, 'span.calories', 'td.calories'),
+            'protein': self._safe_extract_number(item, 'span.protein', 'td.protein'),
+            'carbs': self._safe_extract_number(item, 'span.carbs', 'td.carbs'),
+            'fats': self._safe_extract_number(item, 'span.fats', 'td.fats'),
+            'source': 'kaloricketabulky.cz'
+        }
+        
+        # Only return if we got at least a name
+        if food['name']:
+            return food
+        return None
     
+    @cached('kt:details')
     def get_food_details(self, food_id: str) -> Optional[Dict]:
         """
         Get detailed nutrition information for a specific food.
@@ -163,10 +439,10 @@ class KalorickeTabulkyScraper:
             logger.info(f"Fetching details for food_id: {food_id}")
             response = self._rate_limited_request(detail_url)
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            tree = _parse_html(response)
             
             # Parse nutrition table
-            nutrition = self._parse_nutrition_table(soup)
+            nutrition = self._parse_nutrition_table(tree)
             
             if nutrition:
                 nutrition['food_id'] = food_id
@@ -175,83 +451,84 @@ class KalorickeTabulkyScraper:
             
             return None
             
-        except Exception as e:
+        except (requests.RequestException, lxml.etree.LxmlError) as e:
             logger.error(f"Failed to get details for food_id {food_id}: {e}")
             return None
     
-    def _parse_nutrition_table(self, soup) -> Optional[Dict]:
+    async def aget_food_details(self, food_id: str) -> Optional[Dict]:
+        """Async variant of get_food_details.
+        
+        Runs the blocking request in the event loop's default executor so
+        several foods can be fetched concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_food_details, food_id)
+    
+    def _parse_nutrition_table(self, tree) -> Optional[Dict]:
         """
         Parse nutrition facts from page.
         
         Note: Placeholder implementation - needs actual HTML structure.
         """
-        try:
-            # Try to find nutrition table
-            table = soup.find('table', class_='nutrition-facts')
-            if not table:
-                table = soup.find('table', id='nutrition')
-            if not table:
-                # Try finding any table with nutrition data
-                tables = soup.find_all('table')
-                for t in tables:
-                    if 'kalorie' in t.get_text().lower() or 'energie' in t.get_text().lower():
-                        table = t
-                        break
-            
-            if not table:
-                logger.warning("No nutrition table found")
-                return None
-            
-            nutrition = {
-                'name': self._safe_extract(soup, 'h1', 'h2'),
-                'calories': 0.0,
-                'protein': 0.0,
-                'carbs': 0.0,
-                'fats': 0.0,
-                'fiber': 0.0,
-                'sugars': 0.0,
-                'salt': 0.0,
-            }
-            
-            # Parse table rows
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    label = cells[0].get_text().strip().lower()
-                    value_text = cells[1].get_text().strip()
-                    
-                    # Try to extract number
-                    value = self._extract_number_from_text(value_text)
-                    
-                    # Map Czech labels to fields
-                    if 'energie' in label or 'kalorie' in label:
-                        nutrition['calories'] = value
-                    elif 'bílkovin' in label or 'protein' in label:
-                        nutrition['protein'] = value
-                    elif 'sacharid' in label or 'carbohydrate' in label:
-                        nutrition['carbs'] = value
-                    elif 'tuk' in label and 'nenasycen' not in label:
-                        nutrition['fats'] = value
-                    elif 'vláknina' in label or 'fiber' in label:
-                        nutrition['fiber'] = value
-                    elif 'cukr' in label or 'sugar' in label:
-                        nutrition['sugars'] = value
-                    elif 'sůl' in label or 'salt' in label or 'sodík' in label:
-                        nutrition['salt'] = value
-            
-            return nutrition
-            
-        except Exception as e:
-            logger.error(f"Failed to parse nutrition table: {e}")
+        # Try to find nutrition table
+        table = _find(tree, 'table.nutrition-facts')
+        if table is None:
+            table = _find(tree, 'table#nutrition')
+        if table is None:
+            # Try finding any table with nutrition data
+            for t in _find_all(tree, 'table'):
+                text = t.text_content().lower()
+                if 'kalorie' in text or 'energie' in text:
+                    table = t
+                    break
+        
+        if table is None:
+            logger.warning("No nutrition table found")
             return None
+        
+        nutrition = {
+            'name': self._safe_extract(tree, 'h1', 'h2'),
+            'calories': 0.0,
+            'protein': 0.0,
+            'carbs': 0.0,
+            'fats': 0.0,
+            'fiber': 0.0,
+            'sugars': 0.0,
+            'salt': 0.0,
+        }
+        
+        # Parse table rows
+        for label_cell, value_cell in zip(_LABEL_CELLS(table), _VALUE_CELLS(table)):
+            label = label_cell.text_content().strip().lower()
+            value_text = value_cell.text_content().strip()
+            
+            # Try to extract number
+            value = self._extract_number_from_text(value_text)
+            
+            # Map Czech labels to fields
+            matches = [
+                _LABEL_FIELDS[keyword] for keyword in _LABEL_RE.findall(label)
+                # Unsaturated fats are not total fats
+                if keyword != 'tuk' or 'nenasycen' not in label
+            ]
+            if matches:
+                nutrition[min(matches)[1]] = value
+        
+        return nutrition
     
-    def get_nutrition_info(self, food_name: str) -> Optional[Dict]:
+    def get_nutrition_info(self, food_name: str,
+                           required_fields: Tuple[str, ...] = ('calories', 'protein', 'carbs', 'fats')
+                           ) -> Optional[Dict]:
         """
         Search for food and return nutrition info.
         
+        The search result row is used as is when it already shows all
+        required nutrients; the details page is only fetched otherwise.
+        
         Args:
             food_name: Name of the food to search for
+            required_fields: Nutrients that must be non-zero in the search
+                result to skip the details request
             
         Returns:
             Dictionary with nutrition data (per 100g) or None if not found
@@ -266,6 +543,10 @@ class KalorickeTabulkyScraper:
         # Get the first result
         food = results[0]
         
+        # Inline values from the result row are enough, skip the second request
+        if all(food.get(field) for field in required_fields):
+            return food
+        
         # If we have a food_id, get detailed info
         if food.get('food_id'):
             details = self.get_food_details(food['food_id'])
@@ -275,6 +556,33 @@ class KalorickeTabulkyScraper:
         # Return what we have from search results
         return food
     
+    def get_nutrition_info_batch(self, food_names: List[str],
+                                 max_workers: int = 4) -> List[Optional[Dict]]:
+        """
+        Get nutrition info for several foods concurrently.
+        
+        Lookups share the rate limiter, so requests are still spaced out
+        by `rate_limit`, but their network waits overlap. Duplicate names
+        are looked up only once.
+        
+        Args:
+            food_names: Names of the foods to search for
+            max_workers: Maximum number of lookups in flight
+            
+        Returns:
+            List of nutrition dictionaries (see get_nutrition_info), or None
+            for foods that were not found, in the same order as food_names
+        """
+        unique_names = list(dict.fromkeys(food_names))
+        if not unique_names:
+            return []
+        
+        workers = min(max_workers, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            by_name = dict(zip(unique_names, executor.map(self.get_nutrition_info, unique_names)))
+        
+        return [by_name[name] for name in food_names]
+    
     def scrape_category(self, category: str, limit: Optional[int] = None) -> List[Dict]:
         """
         Scrape all foods from a specific category.
@@ -294,58 +602,104 @@ class KalorickeTabulkyScraper:
             logger.info(f"Scraping category: {category}")
             response = self._rate_limited_request(category_url)
             
-            soup = BeautifulSoup(response.content, 'lxml')
+            tree = _parse_html(response)
             
             foods = []
-            items = soup.find_all('div', class_='food-item')
+            items = _find_all(tree, 'div.food-item')
             
             if not items:
-                items = soup.find_all('tr', class_='food-row')
+                items = _find_all(tree, 'tr.food-row')
             
             for i, item in enumerate(items):
                 if limit and i >= limit:
                     break
-                    
-                try:
-                    food = self._parse_food_item(item)
-                    if food:
-                        foods.append(food)
-                except Exception as e:
-                    logger.warning(f"Failed to parse item: {e}")
-                    continue
+                
+                food = self._parse_food_item(item)
+                if food:
+                    foods.append(food)
             
             logger.info(f"Scraped {len(foods)} foods from category '{category}'")
             return foods
             
-        except Exception as e:
+        except (requests.RequestException, lxml.etree.LxmlError) as e:
             logger.error(f"Failed to scrape category '{category}': {e}")
             return []
     
+    async def ascrape_category_details(self, category: str, limit: Optional[int] = None,
+                                       max_concurrency: int = 4) -> List[Dict]:
+        """Async variant of scrape_category_details."""
+        loop = asyncio.get_running_loop()
+        foods = await loop.run_in_executor(None, self.scrape_category, category, limit)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(food):
+            if not food.get('food_id'):
+                return food
+            async with semaphore:
+                details = await self.aget_food_details(food['food_id'])
+            return details or food
+        
+        return list(await asyncio.gather(*(fetch(food) for food in foods)))
+    
+    def scrape_category_details(self, category: str, limit: Optional[int] = None,
+                                max_concurrency: int = 4) -> List[Dict]:
+        """
+        Scrape a category and fetch the detailed nutrition of each food.
+        
+        Detail pages are fetched concurrently, at most `max_concurrency` at
+        a time, while request starts still honor the rate limit.
+        
+        Args:
+            category: Category name or URL path
+            limit: Maximum number of items to scrape
+            max_concurrency: Maximum number of detail requests in flight
+            
+        Returns:
+            List of food dictionaries, with details where they were found,
+            in listing order
+        """
+        foods = self.scrape_category(category, limit)
+        to_fetch = [food for food in foods if food.get('food_id')]
+        if not to_fetch:
+            return foods
+        
+        def fetch(food):
+            return self.get_food_details(food['food_id']) or food
+        
+        workers = min(max_concurrency, len(to_fetch))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            detailed = iter(list(executor.map(fetch, to_fetch)))
+        
+        return [next(detailed) if food.get('food_id') else food for food in foods]
+    
     def export_to_json(self, foods: List[Dict], filename: str):
-        """Export scraped data to JSON file."""
+        """Export scraped data to JSON file.
+        
+        A .jsonl (or .jsonl.gz) filename writes one food per line, so large
+        exports can be read back as a stream. A .gz suffix compresses the
+        output with gzip.
+        """
         try:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(foods, f, ensure_ascii=False, indent=2)
+            with _open_export(filename) as f:
+                if filename.endswith(('.jsonl', '.jsonl.gz')):
+                    f.writelines(_json.dumps(food) + b'\n' for food in foods)
+                else:
+                    f.write(_json.dumps_indented(foods))
             logger.info(f"Exported {len(foods)} foods to {filename}")
         except Exception as e:
             logger.error(f"Failed to export to JSON: {e}")
     
     def export_to_csv(self, foods: List[Dict], filename: str):
-        """Export scraped data to CSV file."""
+        """Export scraped data to CSV file, gzip-compressed if it ends in .gz."""
         try:
-            import csv
-            
             if not foods:
                 logger.warning("No foods to export")
                 return
             
-            # Get all unique keys
-            fieldnames = set()
-            for food in foods:
-                fieldnames.update(food.keys())
-            fieldnames = sorted(fieldnames)
+            # Get all unique keys in first-seen order
+            fieldnames = list(dict.fromkeys(key for food in foods for key in food))
             
-            with open(filename, 'w', encoding='utf-8', newline='') as f:
+            with _open_export(filename, text=True) as f:
                 writer = csv.DictWriter(f, fieldnames=fieldnames)
                 writer.writeheader()
                 writer.writerows(foods)
@@ -354,20 +708,40 @@ class KalorickeTabulkyScraper:
         except Exception as e:
             logger.error(f"Failed to export to CSV: {e}")
     
+    def to_dataframe(self, foods: List[Dict]):
+        """
+        Convert scraped foods to a pandas DataFrame.
+        
+        Nutrient columns are stored as float32, so filtering, sorting and
+        grouping large category scrapes run column-wise instead of over
+        Python dicts, e.g. ``df[df.calories > 0].nlargest(10, 'protein')``.
+        
+        Args:
+            foods: Food dictionaries as returned by the scraping methods
+            
+        Returns:
+            pandas.DataFrame with one row per food
+        """
+        # Imported here so the scraper doesn't pay pandas' import time
+        # unless a DataFrame is requested
+        import pandas as pd
+        
+        df = pd.DataFrame.from_records(foods)
+        nutrients = [field for field, _ in _LABEL_KEYWORDS if field in df.columns]
+        return df.astype(dict.fromkeys(nutrients, 'float32'))
+    
     # Helper methods
     
     def _safe_extract(self, element, *selectors) -> str:
         """Try multiple selectors to extract text."""
         for selector in selectors:
             try:
-                if '.' in selector or '#' in selector:
-                    found = element.select_one(selector)
-                else:
-                    found = element.find(selector)
+                found = _find(element, selector)
                 
-                if found:
-                    return found.get_text().strip()
-            except:
+                if found is not None:
+                    return found.text_content().strip()
+            except AttributeError:
+                # Not an element (e.g. None passed in)
                 continue
         return ''
     
@@ -378,10 +752,9 @@ class KalorickeTabulkyScraper:
     
     def _extract_number_from_text(self, text: str) -> float:
         """Extract first number from text."""
-        import re
         # Remove common units and extract number
         text = text.replace(',', '.').replace(' ', '')
-        match = re.search(r'(\d+\.?\d*)', text)
+        match = _NUMBER_RE.search(text)
         if match:
             try:
                 return float(match.group(1))
@@ -393,22 +766,45 @@ class KalorickeTabulkyScraper:
         """Try to extract food ID from element."""
         # Try data attributes
         for attr in ['data-id', 'data-food-id', 'id']:
-            if element.has_attr(attr):
-                return element[attr]
+            if element.get(attr) is not None:
+                return element.get(attr)
         
         # Try to extract from href
-        link = element.find('a')
-        if link and link.has_attr('href'):
-            href = link['href']
+        link = _find(element, 'a')
+        if link is not None and link.get('href') is not None:
+            href = link.get('href')
             # Extract ID from URL pattern like /food/12345 or /potraviny/12345
-            import re
-            match = re.search(r'/(?:food|potraviny)/(\d+)', href)
+            match = _FOOD_ID_RE.search(href)
             if match:
                 return match.group(1)
         
         return None
 
 
+def get_kt_scraper(rate_limit_seconds: float = 1.0) -> KalorickeTabulkyScraper:
+    """
+    Return a shared scraper for the given rate limit.
+    
+    Callers share its caches and rate limiter, so separate callers don't
+    together exceed the rate limit.
+    
+    Args:
+        rate_limit_seconds: Average delay between requests
+        
+    Returns:
+        The scraper for rate_limit_seconds, created on first use
+    """
+    # Normalized before the lookup so that get_kt_scraper(), (1) and
+    # (rate_limit_seconds=1.0) share a scraper
+    return _get_kt_scraper(float(rate_limit_seconds))
+
+
+@lru_cache(maxsize=4)
+def _get_kt_scraper(rate_limit_seconds: float) -> KalorickeTabulkyScraper:
+    """Create the scraper for get_kt_scraper, once per rate limit."""
+    return KalorickeTabulkyScraper(rate_limit_seconds=rate_limit_seconds)
+
+
 # Convenience function
 def scrape_kaloricketabulky(food_name: str) -> Optional[Dict]:
     """
@@ -422,5 +818,4 @@ def scrape_kaloricketabulky(food_name: str) -> Optional[Dict]:
     Returns:
         Dictionary with nutrition data or None
     """
-    scraper = KalorickeTabulkyScraper()
-    return scraper.get_nutrition_info(food_name)
+    return get_kt_scraper().get_nutrition_info(food_name)
@@ -1,5 +1,9 @@
 """Scraper for kupi.cz food discount portal using kupiapi library."""
 
+import asyncio
+import heapq
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 import logging
 
@@ -15,6 +19,8 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+_PERCENT_RE = re.compile(r'-?\d+(?:\.\d+)?')
+
 
 class KupiScraper:
     """Scrapes food discounts from kupi.cz using kupiapi library."""
@@ -76,6 +82,37 @@ class KupiScraper:
             logger.error(f"Error fetching discounts from {shop_name}: {e}")
             return []
     
+    async def aget_discounts_by_shop(self, shop_name: str) -> List[Dict[str, str]]:
+        """Async variant of get_discounts_by_shop.
+        
+        kupiapi is synchronous, so the call runs in the event loop's default
+        executor; several shops can then be fetched with asyncio.gather().
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_discounts_by_shop, shop_name)
+    
+    def get_discounts_by_shops(self, shop_names: List[str],
+                               max_workers: int = 4) -> Dict[str, List[Dict[str, str]]]:
+        """Get discounts for several shops concurrently.
+        
+        Shops are fetched from a small thread pool; keep `max_workers` low
+        to stay within kupi.cz rate limits.
+        
+        Args:
+            shop_names: Shop names (see get_discounts_by_shop)
+            max_workers: Maximum number of shops fetched at once
+            
+        Returns:
+            Dictionary mapping each shop name to its discounts
+        """
+        if not shop_names:
+            return {}
+        
+        workers = min(max_workers, len(shop_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(self.get_discounts_by_shop, shop_names)
+            return dict(zip(shop_names, results))
+    
     def search_product(self, product_name: str) -> List[Dict[str, str]]:
         """Search for specific product discounts.
         
@@ -108,14 +145,9 @@ class KupiScraper:
         if not discounts:
             return []
         
-        # Sort by discount percentage
+        # Top `limit` by discount percentage, without sorting the whole list
         try:
-            sorted_discounts = sorted(
-                discounts,
-                key=lambda x: self._extract_discount_percent(x),
-                reverse=True
-            )
-            result = sorted_discounts[:limit]
+            result = heapq.nlargest(limit, discounts, key=self._extract_discount_percent)
             logger.info(f"Returning top {len(result)} deals")
             return result
             
@@ -136,9 +168,5 @@ class KupiScraper:
         # Try different possible keys for discount percentage
         discount_str = discount.get('discount', discount.get('discount_percent', '0%'))
         
-        try:
-            # Remove '%' and any other non-numeric characters except '.' and '-'
-            cleaned = ''.join(c for c in str(discount_str) if c.isdigit() or c in '.-')
-            return float(cleaned) if cleaned else 0.0
-        except (ValueError, AttributeError):
-            return 0.0
+        match = _PERCENT_RE.search(str(discount_str))
+        return float(match.group(0)) if match else 0.0
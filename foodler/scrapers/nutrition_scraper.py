@@ -1,16 +1,12 @@
 """Multi-source nutrition scraper combining API clients."""
 
-from typing import Dict, Optional, List
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional, List, Tuple, Union
 import logging
 
 from .openfoodfacts_api import OpenFoodFactsAPI
 
-try:
-    from .usda_api import USDAFoodDataAPI
-    USDA_AVAILABLE = True
-except ImportError:
-    USDA_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +19,9 @@ class NutritionScraper:
     2. USDA FoodData Central - Secondary source (requires API key)
     """
     
+    # Seconds search_foods waits for USDA once Open Food Facts has answered
+    SEARCH_TIMEOUT = 5.0
+    
     def __init__(self, usda_api_key: Optional[str] = None, 
                  country_code: Optional[str] = 'cz'):
         """Initialize the scraper with multiple API sources.
@@ -33,22 +32,70 @@ class NutritionScraper:
         """
         self.openfoodfacts = OpenFoodFactsAPI()
         self.country_code = country_code
+        # Runs USDA lookups alongside Open Food Facts; threads start on demand
+        self._executor = ThreadPoolExecutor(max_workers=4)
         
-        # Initialize USDA API if key is provided
+        # Initialize USDA API if key is provided; the client module is only
+        # imported then
         self.usda = None
-        if USDA_AVAILABLE and usda_api_key:
+        if usda_api_key:
             try:
-                self.usda = USDAFoodDataAPI(usda_api_key)
+                from .usda_api import get_usda_client
+                self.usda = get_usda_client(usda_api_key)
                 logger.info("USDA FoodData Central API initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize USDA API: {e}")
         
         logger.info(f"NutritionScraper initialized (country: {country_code})")
     
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
+    def close(self):
+        """Shut down the worker threads used for USDA lookups.
+        
+        Called automatically when the scraper is used as a context manager.
+        The API clients are left open, since the USDA client may be shared.
+        """
+        self._executor.shutdown(wait=True)
+    
+    def _query_sources(self, off_lookup: Callable[[], Any],
+                       usda_lookup: Callable[[], Any],
+                       timeout: Optional[float] = None) -> Tuple[Any, Any]:
+        """Run an Open Food Facts and a USDA lookup concurrently.
+        
+        The USDA lookup runs in a worker thread while Open Food Facts is
+        queried in the calling thread, so a query takes as long as the
+        slower source rather than both in sequence.
+        
+        Args:
+            off_lookup: Open Food Facts lookup
+            usda_lookup: USDA lookup, only called if USDA is configured
+            timeout: Seconds to wait for USDA after Open Food Facts has
+                answered; None waits until it finishes
+            
+        Returns:
+            Tuple of (Open Food Facts result, USDA result or None)
+        """
+        if not self.usda:
+            return off_lookup(), None
+        
+        usda_future = self._executor.submit(usda_lookup)
+        off_result = off_lookup()
+        try:
+            return off_result, usda_future.result(timeout=timeout)
+        except FutureTimeoutError:
+            logger.warning(f"USDA lookup timed out after {timeout}s, using Open Food Facts only")
+            return off_result, None
+    
     def get_nutrition_info(self, food_name: str) -> Optional[Dict[str, float]]:
         """Get nutritional information for a food item.
         
-        Tries multiple sources in order of priority:
+        Queries all sources concurrently and returns the first usable
+        result in order of priority:
         1. Open Food Facts (prioritizing country-specific products)
         2. USDA FoodData Central (if available)
         
@@ -70,26 +117,78 @@ class NutritionScraper:
             
             Returns None if food not found in any source
         """
-        # Try Open Food Facts first (better for Czech/Slovak products)
-        logger.info(f"Searching for '{food_name}' in Open Food Facts")
-        nutrition = self.openfoodfacts.get_nutrition_info(food_name, self.country_code)
+        logger.info(f"Searching for '{food_name}' in Open Food Facts"
+                    f"{' and USDA FoodData Central' if self.usda else ''}")
+        off_nutrition, usda_nutrition = self._query_sources(
+            lambda: self.openfoodfacts.get_nutrition_info(food_name, self.country_code),
+            lambda: self.usda.get_nutrition_info(food_name)
+        )
         
-        if nutrition and nutrition.get('calories', 0) > 0:
+        # Prefer Open Food Facts (better for Czech/Slovak products)
+        if off_nutrition and off_nutrition.get('calories', 0) > 0:
             logger.info(f"Found '{food_name}' in Open Food Facts")
-            return nutrition
+            return off_nutrition
         
         # Fall back to USDA if available
-        if self.usda:
-            logger.info(f"Searching for '{food_name}' in USDA FoodData Central")
-            nutrition = self.usda.get_nutrition_info(food_name)
-            
-            if nutrition and nutrition.get('calories', 0) > 0:
-                logger.info(f"Found '{food_name}' in USDA FoodData Central")
-                return nutrition
+        if usda_nutrition and usda_nutrition.get('calories', 0) > 0:
+            logger.info(f"Found '{food_name}' in USDA FoodData Central")
+            return usda_nutrition
         
         logger.warning(f"No nutrition data found for '{food_name}'")
         return None
     
+    async def aget_nutrition_info(self, food_name: str) -> Optional[Dict[str, float]]:
+        """Async variant of get_nutrition_info.
+        
+        Runs the blocking multi-source lookup in the event loop's default
+        executor so several foods can be looked up concurrently.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_nutrition_info, food_name)
+    
+    async def aget_nutrition_info_batch(self, food_names: List[str],
+                                        max_concurrency: int = 8) -> List[Optional[Dict]]:
+        """Async variant of get_nutrition_info_batch."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def lookup(food_name):
+            async with semaphore:
+                return await self.aget_nutrition_info(food_name)
+        
+        # Identical names are looked up only once
+        unique_names = list(dict.fromkeys(food_names))
+        results = await asyncio.gather(*(lookup(name) for name in unique_names))
+        by_name = dict(zip(unique_names, results))
+        
+        return [by_name[name] for name in food_names]
+    
+    def get_nutrition_info_batch(self, food_names: List[str],
+                                 max_concurrency: int = 8) -> List[Optional[Dict]]:
+        """Get nutritional information for several food items at once.
+        
+        Lookups run concurrently on a thread pool, at most
+        `max_concurrency` at a time, and duplicate names are fetched only
+        once. Safe to call from code running inside an event loop; async
+        callers can use aget_nutrition_info_batch instead.
+        
+        Args:
+            food_names: Names of the food items
+            max_concurrency: Maximum number of lookups in flight
+            
+        Returns:
+            List of nutrition dictionaries (see get_nutrition_info), or None
+            for foods that were not found, in the same order as food_names
+        """
+        unique_names = list(dict.fromkeys(food_names))
+        if not unique_names:
+            return []
+        
+        workers = min(max_concurrency, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            by_name = dict(zip(unique_names, executor.map(self.get_nutrition_info, unique_names)))
+        
+        return [by_name[name] for name in food_names]
+    
     def get_detailed_info(self, food_name: str) -> Optional[Dict]:
         """Get detailed nutritional information including vitamins and minerals.
         
@@ -99,22 +198,22 @@ class NutritionScraper:
         Returns:
             Dictionary with detailed nutritional information or None if not found
         """
-        # Try Open Food Facts first
-        logger.info(f"Searching for detailed info of '{food_name}' in Open Food Facts")
-        detailed = self.openfoodfacts.get_detailed_info(food_name, self.country_code)
+        logger.info(f"Searching for detailed info of '{food_name}' in Open Food Facts"
+                    f"{' and USDA' if self.usda else ''}")
+        off_detailed, usda_detailed = self._query_sources(
+            lambda: self.openfoodfacts.get_detailed_info(food_name, self.country_code),
+            lambda: self.usda.get_detailed_info(food_name)
+        )
         
-        if detailed:
+        # Prefer Open Food Facts
+        if off_detailed:
             logger.info(f"Found detailed info for '{food_name}' in Open Food Facts")
-            return detailed
+            return off_detailed
         
         # Fall back to USDA if available
-        if self.usda:
-            logger.info(f"Searching for detailed info of '{food_name}' in USDA")
-            detailed = self.usda.get_detailed_info(food_name)
-            
-            if detailed:
-                logger.info(f"Found detailed info for '{food_name}' in USDA")
-                return detailed
+        if usda_detailed:
+            logger.info(f"Found detailed info for '{food_name}' in USDA")
+            return usda_detailed
         
         logger.warning(f"No detailed nutrition data found for '{food_name}'")
         return None
@@ -122,6 +221,10 @@ class NutritionScraper:
     def search_foods(self, query: str, limit: int = 20) -> List[Dict]:
         """Search for food items matching the query.
         
+        Both sources are searched concurrently. Open Food Facts results come
+        first, followed by USDA results that arrived within SEARCH_TIMEOUT;
+        foods with the same name and brand are listed once.
+        
         Args:
             query: Search query
             limit: Maximum number of results
@@ -131,65 +234,87 @@ class NutritionScraper:
         """
         results = []
         
-        # Search Open Food Facts
-        logger.info(f"Searching for '{query}' in Open Food Facts")
-        off_results = self.openfoodfacts.search_products(
-            query, page_size=limit, country=self.country_code
+        logger.info(f"Searching for '{query}' in Open Food Facts"
+                    f"{' and USDA' if self.usda else ''}")
+        off_results, usda_results = self._query_sources(
+            lambda: self.openfoodfacts.search_products(
+                query, page_size=limit, country=self.country_code
+            ),
+            lambda: self.usda.search_foods(query, page_size=limit),
+            timeout=self.SEARCH_TIMEOUT
         )
         
-        for product in off_results:
-            results.append({
-                'name': product.get('product_name', ''),
-                'brand': product.get('brands', ''),
-                'source': 'Open Food Facts'
-            })
-        
-        # If we have fewer than requested, try USDA
-        if len(results) < limit and self.usda:
-            logger.info(f"Searching for '{query}' in USDA")
-            usda_results = self.usda.search_foods(query, page_size=limit - len(results))
-            
-            for food in usda_results:
-                results.append({
-                    'name': food.get('description', ''),
-                    'brand': food.get('brandOwner', ''),
-                    'source': 'USDA FoodData Central'
-                })
+        candidates = [
+            (product.get('product_name', ''), product.get('brands', ''), 'Open Food Facts')
+            for product in off_results
+        ]
+        # Fill up with USDA results if we have fewer than requested
+        candidates.extend(
+            (food.get('description', ''), food.get('brandOwner', ''), 'USDA FoodData Central')
+            for food in usda_results or []
+        )
+        
+        seen = set()
+        for name, brand, source in candidates:
+            key = ((name or '').lower(), (brand or '').lower())
+            if key in seen:
+                continue
+            seen.add(key)
+            results.append({'name': name, 'brand': brand, 'source': source})
+            if len(results) == limit:
+                break
         
         logger.info(f"Found {len(results)} foods matching '{query}'")
         return results[:limit]
     
-    def get_product_by_barcode(self, barcode: str) -> Optional[Dict]:
+    def get_product_by_barcode(
+        self, barcode: Union[str, List[str]]
+    ) -> Union[Optional[Dict], Dict[str, Optional[Dict]]]:
         """Get product information by barcode.
         
         Currently only supports Open Food Facts (barcode scanning).
         
         Args:
-            barcode: Product barcode (EAN-13, UPC, etc.)
+            barcode: Product barcode (EAN-13, UPC, etc.), or a list of
+                barcodes to resolve in batched requests
             
         Returns:
-            Product dictionary or None if not found
+            Product dictionary or None if not found; for a list, a
+            dictionary mapping each barcode to its product or None
         """
+        if not isinstance(barcode, str):
+            logger.info(f"Looking up {len(barcode)} barcodes in Open Food Facts")
+            products = self.openfoodfacts.get_products_by_barcodes(barcode)
+            return {
+                code: self._format_product(product) if product else None
+                for code, product in products.items()
+            }
+        
         logger.info(f"Looking up barcode {barcode} in Open Food Facts")
         product = self.openfoodfacts.get_product_by_barcode(barcode)
         
         if product:
             logger.info(f"Found product with barcode {barcode}")
-            nutriments = product.get('nutriments', {})
-            
-            return {
-                'name': product.get('product_name', ''),
-                'brand': product.get('brands', ''),
-                'quantity': product.get('quantity', ''),
-                'calories': nutriments.get('energy-kcal_100g', 0.0),
-                'protein': nutriments.get('proteins_100g', 0.0),
-                'carbs': nutriments.get('carbohydrates_100g', 0.0),
-                'fats': nutriments.get('fat_100g', 0.0),
-                'fiber': nutriments.get('fiber_100g', 0.0),
-                'sugars': nutriments.get('sugars_100g', 0.0),
-                'image_url': product.get('image_url', ''),
-                'source': 'Open Food Facts'
-            }
+            return self._format_product(product)
         
         logger.warning(f"No product found with barcode {barcode}")
         return None
+    
+    @staticmethod
+    def _format_product(product: Dict) -> Dict:
+        """Convert an Open Food Facts product to a nutrition dictionary."""
+        nutriments = product.get('nutriments', {})
+        
+        return {
+            'name': product.get('product_name', ''),
+            'brand': product.get('brands', ''),
+            'quantity': product.get('quantity', ''),
+            'calories': nutriments.get('energy-kcal_100g', 0.0),
+            'protein': nutriments.get('proteins_100g', 0.0),
+            'carbs': nutriments.get('carbohydrates_100g', 0.0),
+            'fats': nutriments.get('fat_100g', 0.0),
+            'fiber': nutriments.get('fiber_100g', 0.0),
+            'sugars': nutriments.get('sugars_100g', 0.0),
+            'image_url': product.get('image_url', ''),
+            'source': 'Open Food Facts'
+        }
@@ -1,24 +1,130 @@
 """Open Food Facts API client for nutrition data."""
 
+import asyncio
 import requests
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, List, Sequence
 import logging
 
+from . import _json
+from ._http import mount_pooled_adapter
+from .cache import LRUCache, RedisCache, SQLiteCache, TieredCache, cached
+
 logger = logging.getLogger(__name__)
 
+# Product fields requested from the search API, so responses carry only
+# what the client reads instead of full product records
+BASIC_FIELDS = ('product_name', 'nutriments', 'brands', 'quantity', 'image_url',
+                'countries_tags')
+DETAILED_FIELDS = BASIC_FIELDS + ('categories', 'ingredients_text', 'nutriscore_grade',
+                                  'nova_group', 'serving_size')
+
+# (output key, Open Food Facts nutriment key) pairs, in output order
+NUTRITION_KEYS = (
+    ('calories', 'energy-kcal_100g'),
+    ('protein', 'proteins_100g'),
+    ('carbs', 'carbohydrates_100g'),
+    ('fats', 'fat_100g'),
+    ('fiber', 'fiber_100g'),
+    ('sugars', 'sugars_100g'),
+    ('salt', 'salt_100g'),
+    ('saturated_fats', 'saturated-fat_100g'),
+)
+
+DETAILED_NUTRITION_KEYS = (
+    # Macronutrients
+    ('calories', 'energy-kcal_100g'),
+    ('protein', 'proteins_100g'),
+    ('carbs', 'carbohydrates_100g'),
+    ('fats', 'fat_100g'),
+    ('fiber', 'fiber_100g'),
+    ('sugars', 'sugars_100g'),
+    ('salt', 'salt_100g'),
+    ('sodium', 'sodium_100g'),
+
+    # Fat breakdown
+    ('saturated_fats', 'saturated-fat_100g'),
+    ('monounsaturated_fats', 'monounsaturated-fat_100g'),
+    ('polyunsaturated_fats', 'polyunsaturated-fat_100g'),
+    ('trans_fats', 'trans-fat_100g'),
+    ('cholesterol', 'cholesterol_100g'),
+
+    # Vitamins (if available)
+    ('vitamin_a', 'vitamin-a_100g'),
+    ('vitamin_c', 'vitamin-c_100g'),
+    ('vitamin_d', 'vitamin-d_100g'),
+    ('vitamin_e', 'vitamin-e_100g'),
+
+    # Minerals (if available)
+    ('calcium', 'calcium_100g'),
+    ('iron', 'iron_100g'),
+    ('magnesium', 'magnesium_100g'),
+    ('potassium', 'potassium_100g'),
+    ('zinc', 'zinc_100g'),
+)
+
+
+def _has_calories(product: Dict) -> bool:
+    """Whether a product has a positive calorie value.
+    
+    Open Food Facts sometimes returns nutriment values as strings or null.
+    """
+    try:
+        return float((product.get('nutriments') or {}).get('energy-kcal_100g') or 0) > 0
+    except (TypeError, ValueError):
+        return False
+
 
 class OpenFoodFactsAPI:
     """Client for Open Food Facts API - Free, open-source nutrition database."""
     
     BASE_URL = "https://world.openfoodfacts.org"
     
-    def __init__(self):
-        """Initialize the API client."""
-        self.session = requests.Session()
+    def __init__(self, cache: bool = True, redis_url: Optional[str] = None,
+                 cache_path: Optional[str] = None):
+        """Initialize the API client.
+        
+        Args:
+            cache: Cache lookup and search results in memory for 24h (see
+                  `cache.hits`/`cache.misses`)
+            redis_url: Optional Redis URL to also share cached results between
+                      processes (entries expire after 24h)
+            cache_path: Optional SQLite file (e.g. '~/.foodler/off_cache.db')
+                       to persist cached results across runs, for 7 days.
+                       Ignored if redis_url is given.
+        """
+        self.session = mount_pooled_adapter(requests.Session())
         self.session.headers.update({
             'User-Agent': 'Foodler - Food Management App - v0.1.0 - Contact: github.com/PrismQDev/Foodler.Research'
         })
+        
+        self.cache = None
+        if cache:
+            shared = None
+            if redis_url:
+                shared = RedisCache(redis_url)
+            elif cache_path:
+                shared = SQLiteCache(cache_path)
+            self.cache = TieredCache(LRUCache(maxsize=2048, ttl=86400), shared)
     
+    def warm_up(self) -> bool:
+        """Open a connection to Open Food Facts ahead of the first lookup.
+        
+        The DNS lookup and TCP/TLS handshake happen here, and the kept-alive
+        connection is reused by the next request. Call it, e.g. from a
+        background thread, at startup or after the app was idle.
+        
+        Returns:
+            True if the server was reached
+        """
+        try:
+            self.session.head(self.BASE_URL, timeout=10)
+            return True
+        except requests.RequestException as e:
+            logger.debug(f"Open Food Facts warm-up failed: {e}")
+            return False
+    
+    @cached('off:barcode')
     def get_product_by_barcode(self, barcode: str) -> Optional[Dict]:
         """Get product information by barcode.
         
@@ -33,19 +139,67 @@ class OpenFoodFactsAPI:
             response = self.session.get(url, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json.loads(response.content)
             if data.get('status') == 1:
-                return data.get('product')
+                product = data.get('product')
+                self._remember_product(product)
+                return product
             
             logger.info(f"Product with barcode {barcode} not found")
             return None
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error fetching product by barcode {barcode}: {e}")
             return None
     
+    def get_products_by_barcodes(self, barcodes: List[str],
+                                 batch_size: int = 100) -> Dict[str, Optional[Dict]]:
+        """Get product information for several barcodes.
+        
+        Barcodes are resolved in batches through the search API, one
+        request per `batch_size` barcodes instead of one per barcode.
+        Products carry the BASIC_FIELDS and their `code`.
+        
+        Args:
+            barcodes: Product barcodes (EAN-13, UPC, etc.)
+            batch_size: Barcodes resolved per request (max 100)
+            
+        Returns:
+            Dictionary mapping each barcode to its product, or None if it
+            was not found or its batch failed
+        """
+        unique = list(dict.fromkeys(barcodes))
+        found = {}
+        url = f"{self.BASE_URL}/api/v2/search"
+        fields = ','.join(('code',) + BASIC_FIELDS)
+        batch_size = min(batch_size, 100)
+        
+        for start in range(0, len(unique), batch_size):
+            batch = unique[start:start + batch_size]
+            params = {
+                'code': ','.join(batch),
+                'fields': fields,
+                'page_size': len(batch)
+            }
+            try:
+                response = self.session.get(url, params=params, timeout=10)
+                response.raise_for_status()
+                
+                data = _json.loads(response.content)
+                for product in data.get('products', []):
+                    found[product.get('code')] = product
+                    
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"Error fetching {len(batch)} products by barcode: {e}")
+        
+        logger.info(f"Found {len(found)} of {len(unique)} products by barcode")
+        return {barcode: found.get(barcode) for barcode in barcodes}
+    
+    @cached('off:search')
     def search_products(self, query: str, page: int = 1, page_size: int = 20,
-                       country: Optional[str] = None) -> List[Dict]:
+                       country: Optional[str] = None,
+                       fields: str = ','.join(BASIC_FIELDS),
+                       sort_by: Optional[str] = None) -> List[Dict]:
         """Search for products by name.
         
         Args:
@@ -53,6 +207,8 @@ class OpenFoodFactsAPI:
             page: Page number (starting from 1)
             page_size: Number of results per page (max 100)
             country: Optional country code to filter results (e.g., 'cz', 'sk')
+            fields: Comma-separated product fields to return
+            sort_by: Optional sort order (e.g., 'popularity_key')
             
         Returns:
             List of product dictionaries
@@ -64,9 +220,12 @@ class OpenFoodFactsAPI:
                 'json': 1,
                 'page': page,
                 'page_size': min(page_size, 100),
-                'fields': 'product_name,nutriments,brands,quantity,image_url,countries_tags'
+                'fields': fields
             }
             
+            if sort_by:
+                params['sort_by'] = sort_by
+            
             if country:
                 params['tagtype_0'] = 'countries'
                 params['tag_contains_0'] = 'contains'
@@ -75,13 +234,52 @@ class OpenFoodFactsAPI:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json.loads(response.content)
             return data.get('products', [])
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error searching products for '{query}': {e}")
             return []
     
+    def _remember_product(self, product: Optional[Dict]):
+        """Cache a product fetched by barcode under its exact name.
+        
+        Scanned products are often looked up by name right after, e.g.
+        for their nutrition info; _fetch_product() then reuses the full
+        barcode response instead of searching again. Only products with
+        calorie data are kept, and only a lookup by the product's exact
+        name reuses them, so a scan doesn't replace the popularity-ranked
+        search for a generic name like "mléko".
+        """
+        name = ((product or {}).get('product_name') or '').strip()
+        if self.cache is not None and name and _has_calories(product):
+            self.cache.set(f"off:product:{name}", product)
+    
+    def _fetch_product(self, food_name: str, country: Optional[str]) -> Optional[Dict]:
+        """Return the best matching product with all DETAILED_FIELDS.
+        
+        The most popular matches are fetched and the first one with a
+        calorie value wins, so a top hit without nutrition data doesn't
+        make callers fall back to another source. get_nutrition_info and
+        get_detailed_info both read from this one search, so looking up
+        both for a food costs a single (cached) request. A product
+        previously fetched by barcode is returned without a search when
+        food_name is its exact name.
+        """
+        if self.cache is not None:
+            product = self.cache.get(f"off:product:{food_name.strip()}")
+            if product is not None:
+                return product
+        
+        products = self.search_products(food_name, page_size=5, country=country,
+                                        fields=','.join(DETAILED_FIELDS),
+                                        sort_by='popularity_key')
+        for product in products:
+            if _has_calories(product):
+                return product
+        return products[0] if products else None
+    
+    @cached('off:nutrition')
     def get_nutrition_info(self, food_name: str, country: Optional[str] = None) -> Optional[Dict]:
         """Get nutritional information for a food item.
         
@@ -106,27 +304,21 @@ class OpenFoodFactsAPI:
             
             Returns None if food not found
         """
-        products = self.search_products(food_name, page_size=1, country=country)
+        product = self._fetch_product(food_name, country)
         
-        if products:
-            product = products[0]
+        if product:
             nutriments = product.get('nutriments', {})
             
             nutrition_info = {
                 'name': product.get('product_name', ''),
                 'brand': product.get('brands', ''),
                 'quantity': product.get('quantity', ''),
-                'calories': nutriments.get('energy-kcal_100g', 0.0),
-                'protein': nutriments.get('proteins_100g', 0.0),
-                'carbs': nutriments.get('carbohydrates_100g', 0.0),
-                'fats': nutriments.get('fat_100g', 0.0),
-                'fiber': nutriments.get('fiber_100g', 0.0),
-                'sugars': nutriments.get('sugars_100g', 0.0),
-                'salt': nutriments.get('salt_100g', 0.0),
-                'saturated_fats': nutriments.get('saturated-fat_100g', 0.0),
-                'image_url': product.get('image_url', ''),
-                'source': 'Open Food Facts'
             }
+            nutrition_info.update(
+                {key: nutriments.get(off_key, 0.0) for key, off_key in NUTRITION_KEYS}
+            )
+            nutrition_info['image_url'] = product.get('image_url', '')
+            nutrition_info['source'] = 'Open Food Facts'
             
             logger.info(f"Found nutrition info for '{food_name}': {nutrition_info['name']}")
             return nutrition_info
@@ -134,6 +326,18 @@ class OpenFoodFactsAPI:
         logger.info(f"No nutrition info found for '{food_name}'")
         return None
     
+    async def aget_nutrition_info(self, food_name: str,
+                                  country: Optional[str] = None) -> Optional[Dict]:
+        """Async variant of get_nutrition_info.
+        
+        The blocking request runs in the event loop's default executor, so
+        several lookups can be awaited together with asyncio.gather() while
+        sharing this client's connection pool.
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_nutrition_info, food_name, country)
+    
+    @cached('off:detailed')
     def get_detailed_info(self, food_name: str, country: Optional[str] = None) -> Optional[Dict]:
         """Get detailed nutritional information including vitamins and minerals.
         
@@ -144,10 +348,9 @@ class OpenFoodFactsAPI:
         Returns:
             Dictionary with detailed nutritional information including vitamins and minerals
         """
-        products = self.search_products(food_name, page_size=1, country=country)
+        product = self._fetch_product(food_name, country)
         
-        if products:
-            product = products[0]
+        if product:
             nutriments = product.get('nutriments', {})
             
             # Extract all available nutrient data
@@ -157,37 +360,11 @@ class OpenFoodFactsAPI:
                 'quantity': product.get('quantity', ''),
                 'categories': product.get('categories', ''),
                 'ingredients_text': product.get('ingredients_text', ''),
-                
-                # Macronutrients
-                'calories': nutriments.get('energy-kcal_100g', 0.0),
-                'protein': nutriments.get('proteins_100g', 0.0),
-                'carbs': nutriments.get('carbohydrates_100g', 0.0),
-                'fats': nutriments.get('fat_100g', 0.0),
-                'fiber': nutriments.get('fiber_100g', 0.0),
-                'sugars': nutriments.get('sugars_100g', 0.0),
-                'salt': nutriments.get('salt_100g', 0.0),
-                'sodium': nutriments.get('sodium_100g', 0.0),
-                
-                # Fat breakdown
-                'saturated_fats': nutriments.get('saturated-fat_100g', 0.0),
-                'monounsaturated_fats': nutriments.get('monounsaturated-fat_100g', 0.0),
-                'polyunsaturated_fats': nutriments.get('polyunsaturated-fat_100g', 0.0),
-                'trans_fats': nutriments.get('trans-fat_100g', 0.0),
-                'cholesterol': nutriments.get('cholesterol_100g', 0.0),
-                
-                # Vitamins (if available)
-                'vitamin_a': nutriments.get('vitamin-a_100g', 0.0),
-                'vitamin_c': nutriments.get('vitamin-c_100g', 0.0),
-                'vitamin_d': nutriments.get('vitamin-d_100g', 0.0),
-                'vitamin_e': nutriments.get('vitamin-e_100g', 0.0),
-                
-                # Minerals (if available)
-                'calcium': nutriments.get('calcium_100g', 0.0),
-                'iron': nutriments.get('iron_100g', 0.0),
-                'magnesium': nutriments.get('magnesium_100g', 0.0),
-                'potassium': nutriments.get('potassium_100g', 0.0),
-                'zinc': nutriments.get('zinc_100g', 0.0),
-                
+            }
+            detailed_info.update(
+                {key: nutriments.get(off_key, 0.0) for key, off_key in DETAILED_NUTRITION_KEYS}
+            )
+            detailed_info.update({
                 # Scores and grades
                 'nutriscore_grade': product.get('nutriscore_grade', ''),
                 'nova_group': product.get('nova_group', ''),
@@ -196,12 +373,13 @@ class OpenFoodFactsAPI:
                 'image_url': product.get('image_url', ''),
                 'serving_size': product.get('serving_size', '100g'),
                 'source': 'Open Food Facts'
-            }
+            })
             
             return detailed_info
         
         return None
     
+    @cached('off:category')
     def search_by_category(self, category: str, page: int = 1, page_size: int = 20) -> List[Dict]:
         """Search products by category.
         
@@ -220,9 +398,36 @@ class OpenFoodFactsAPI:
             response = self.session.get(url, params=params, timeout=10)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json.loads(response.content)
             return data.get('products', [])
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error searching category '{category}': {e}")
             return []
+    
+    def search_by_category_bulk(self, category: str, pages: Sequence[int] = (1, 2, 3, 4),
+                                page_size: int = 100, max_workers: int = 4) -> List[Dict]:
+        """Fetch several pages of a category concurrently.
+        
+        Pages are fetched from a small thread pool sharing this client's
+        connection pool; keep `max_workers` low to stay within Open Food
+        Facts rate limits.
+        
+        Args:
+            category: Category name (see search_by_category)
+            pages: Page numbers to fetch
+            page_size: Results per page
+            max_workers: Maximum number of pages fetched at once
+            
+        Returns:
+            Products of all pages, in page order
+        """
+        if not pages:
+            return []
+        
+        workers = min(max_workers, len(pages))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(
+                lambda page: self.search_by_category(category, page, page_size), pages
+            )
+            return [product for products in results for product in products]
@@ -1,36 +1,295 @@
 """USDA FoodData Central API client for nutrition data."""
 
 import requests
-from typing import Optional, Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Optional, Dict, List, NamedTuple, Sequence
 import logging
 import os
 
+from . import _json
+from ._http import TokenBucket, mount_pooled_adapter
+from .cache import LRUCache, SQLiteCache, TieredCache, cached
+
 logger = logging.getLogger(__name__)
 
 
+# (output key, USDA nutrient number) pairs, in output order. Numbers are
+# stable across data types, unlike nutrient names
+NUTRITION_NUMBERS = (
+    ('calories', '208'),
+    ('protein', '203'),
+    ('carbs', '205'),
+    ('fats', '204'),
+    ('fiber', '291'),
+    ('sugars', '269'),
+    ('sodium', '307'),
+    ('cholesterol', '601'),
+)
+
+DETAILED_NUTRITION_NUMBERS = (
+    # Macronutrients
+    ('calories', '208'),
+    ('protein', '203'),
+    ('carbs', '205'),
+    ('fats', '204'),
+    ('fiber', '291'),
+    ('sugars', '269'),
+
+    # Fat breakdown
+    ('saturated_fats', '606'),
+    ('monounsaturated_fats', '645'),
+    ('polyunsaturated_fats', '646'),
+    ('trans_fats', '605'),
+    ('cholesterol', '601'),
+
+    # Vitamins
+    ('vitamin_a', '320'),
+    ('vitamin_c', '401'),
+    ('vitamin_d', '328'),
+    ('vitamin_e', '323'),
+    ('vitamin_k', '430'),
+    ('thiamin', '404'),
+    ('riboflavin', '405'),
+    ('niacin', '406'),
+    ('vitamin_b6', '415'),
+    ('folate', '417'),
+    ('vitamin_b12', '418'),
+
+    # Minerals
+    ('calcium', '301'),
+    ('iron', '303'),
+    ('magnesium', '304'),
+    ('phosphorus', '305'),
+    ('potassium', '306'),
+    ('sodium', '307'),
+    ('zinc', '309'),
+)
+
+# Nutrient numbers behind NUTRITION_NUMBERS, for trimming /food/{fdc_id}
+# responses to what get_nutrition_info returns
+BASIC_NUTRIENT_NUMBERS = tuple(number for _, number in NUTRITION_NUMBERS)
+
+# Data types whose search results already list all nutrients, so the
+# full record needn't be fetched for detailed info
+_COMPLETE_DATA_TYPES = frozenset({'Foundation', 'SR Legacy'})
+_MIN_COMPLETE_NUTRIENTS = 20
+
+# Keys reported by USDA in mg but returned in g
+MILLIGRAM_KEYS = frozenset({
+    'sodium', 'cholesterol', 'calcium', 'iron', 'magnesium', 'phosphorus',
+    'potassium', 'zinc'
+})
+
+
+@lru_cache(maxsize=1)
+def _warn_missing_api_key():
+    """Log the missing API key warning, once per process."""
+    logger.warning(
+        "USDA API key not provided. "
+        "Get one at https://fdc.nal.usda.gov/api-key-signup.html"
+    )
+
+
+def _nutrient_amounts(food_nutrients: Sequence[Dict]) -> Dict[str, float]:
+    """Map USDA nutrient numbers to amounts in a single pass.
+    
+    Handles both the flat entries of /foods/search results and the nested
+    entries of /food/{fdc_id} records. A response uses one shape
+    throughout, so it is detected from the first entry.
+    """
+    if not food_nutrients:
+        return {}
+    
+    # Explicit nulls count as zero, like missing values
+    if 'nutrientNumber' in food_nutrients[0]:
+        amounts = {n.get('nutrientNumber'): n.get('value') or 0.0 for n in food_nutrients}
+    else:
+        amounts = {
+            (n.get('nutrient') or {}).get('number'): n.get('amount') or 0.0
+            for n in food_nutrients
+        }
+    
+    # Foundation foods report total sugars as "Sugars, Total" (269.3)
+    if '269' not in amounts and '269.3' in amounts:
+        amounts['269'] = amounts['269.3']
+    return amounts
+
+
+def _parse_nutrients(food: Dict, numbers=NUTRITION_NUMBERS,
+                     to_grams: bool = True) -> Dict[str, float]:
+    """Extract nutritional values per 100g from a USDA food.
+    
+    Shared by the sync and async clients.
+    
+    Args:
+        food: Food dictionary from /foods/search or /food/{fdc_id}
+        numbers: (output key, nutrient number) pairs to extract
+        to_grams: Convert MILLIGRAM_KEYS values from mg to g
+        
+    Returns:
+        Dictionary of output key to value
+    """
+    amounts = _nutrient_amounts(food.get('foodNutrients', ()))
+    values = {key: amounts.get(number, 0.0) for key, number in numbers}
+    if to_grams:
+        for key in MILLIGRAM_KEYS.intersection(values):
+            values[key] /= 1000
+    return values
+
+
+def _has_full_nutrients(food: Dict) -> bool:
+    """Whether a search result carries enough nutrients for parse_detailed_info."""
+    return (food.get('dataType') in _COMPLETE_DATA_TYPES
+            and len(food.get('foodNutrients', ())) >= _MIN_COMPLETE_NUTRIENTS)
+
+
+def parse_nutrition_info(food: Dict) -> Dict:
+    """Build the nutrition dictionary returned by get_nutrition_info.
+    
+    Args:
+        food: Food dictionary from the /foods/search endpoint
+        
+    Returns:
+        Nutrition dictionary (see USDAFoodDataAPI.get_nutrition_info)
+    """
+    return {
+        'name': food.get('description', ''),
+        'brand': food.get('brandOwner', ''),
+        'fdc_id': food.get('fdcId'),
+        'data_type': food.get('dataType', ''),
+        **_parse_nutrients(food),
+        'source': 'USDA FoodData Central'
+    }
+
+
+def parse_detailed_info(food: Dict, to_grams: bool = True) -> Dict:
+    """Build the dictionary returned by get_detailed_info.
+    
+    Args:
+        food: Full food record from /food/{fdc_id} or /foods
+        to_grams: Convert MILLIGRAM_KEYS values from mg to g
+        
+    Returns:
+        Detailed nutrition dictionary
+    """
+    return {
+        'name': food.get('description', ''),
+        'brand': food.get('brandOwner', ''),
+        'fdc_id': food.get('fdcId'),
+        'data_type': food.get('dataType', ''),
+        'ingredients': food.get('ingredients', ''),
+        **_parse_nutrients(food, DETAILED_NUTRITION_NUMBERS, to_grams),
+        'source': 'USDA FoodData Central'
+    }
+
+
+_FoodNutritionFields = NamedTuple('_FoodNutritionFields', [
+    ('name', str),
+    ('brand', str),
+    ('fdc_id', Optional[int]),
+    ('data_type', str),
+    ('ingredients', str),
+    *((key, float) for key, _ in DETAILED_NUTRITION_NUMBERS),
+])
+
+
+class FoodNutrition(_FoodNutritionFields):
+    """Compact, immutable record of a food's detailed nutrition per 100g.
+    
+    Holds the fields of get_detailed_info in a tuple, which takes a
+    fraction of the memory of the equivalent dict when storing thousands
+    of foods. Build DataFrames with
+    ``pandas.DataFrame.from_records(records, columns=FoodNutrition._fields)``.
+    """
+    
+    __slots__ = ()
+    
+    @classmethod
+    def from_food(cls, food: Dict) -> 'FoodNutrition':
+        """Build a record from a USDA food (see parse_detailed_info)."""
+        return cls(
+            food.get('description', ''),
+            food.get('brandOwner', ''),
+            food.get('fdcId'),
+            food.get('dataType', ''),
+            food.get('ingredients', ''),
+            **_parse_nutrients(food, DETAILED_NUTRITION_NUMBERS)
+        )
+    
+    def to_dict(self) -> Dict:
+        """Return the dictionary get_detailed_info returns for this food."""
+        return {**self._asdict(), 'source': 'USDA FoodData Central'}
+
+
 class USDAFoodDataAPI:
-    """Client for USDA FoodData Central API - US Government nutrition database."""
+    """Client for USDA FoodData Central API - US Government nutrition database.
+    
+    Instances are safe to share between threads; get_usda_client() returns
+    a shared instance per API key.
+    """
     
     BASE_URL = "https://api.nal.usda.gov/fdc/v1"
+    SEARCH_URL = BASE_URL + "/foods/search"
+    FOODS_URL = BASE_URL + "/foods"
+    # Formatted with the FDC ID
+    FOOD_URL = BASE_URL + "/food/{}"
+    
+    # Request timeout in seconds
+    TIMEOUT = 10.0
+    
+    # Maximum results per /foods/search page accepted by the API
+    MAX_PAGE_SIZE = 200
     
-    def __init__(self, api_key: Optional[str] = None):
+    # Maximum number of FDC IDs per /foods request
+    FOODS_BATCH_SIZE = 20
+    
+    def __init__(self, api_key: Optional[str] = None, cache: bool = True,
+                 cache_path: Optional[str] = None, requests_per_hour: Optional[int] = 1000,
+                 burst: int = 30):
         """Initialize the API client.
         
         Args:
             api_key: USDA API key. If not provided, will try to read from
                     USDA_API_KEY environment variable
+            cache: Cache food and nutrition lookups in memory (see
+                  `cache.hits`/`cache.misses`)
+            cache_path: Optional SQLite file (e.g. '~/.foodler/usda_cache.db')
+                       to persist cached lookups across runs, for 30 days
+            requests_per_hour: Client-side request rate limit, defaulting to
+                              the USDA quota per key; None disables it
+            burst: Requests that may start back-to-back after an idle period
         """
         self.api_key = api_key or os.environ.get('USDA_API_KEY')
         if not self.api_key:
-            logger.warning(
-                "USDA API key not provided. "
-                "Get one at https://fdc.nal.usda.gov/api-key-signup.html"
-            )
+            _warn_missing_api_key()
         
-        self.session = requests.Session()
+        # The API throttles per key, so back off longer and retry more often.
+        # POST is only used for the read-only /foods lookup, so it is safe
+        # to retry too.
+        self.session = mount_pooled_adapter(requests.Session(), retries=5, backoff_factor=1.0,
+                                            allowed_methods=('GET', 'POST'))
         self.session.headers.update({
-            'User-Agent': 'Foodler - Food Management App - v0.1.0'
+            'User-Agent': 'Foodler - Food Management App - v0.1.0',
+            'Accept': 'application/json'
         })
+        
+        # Staying under the quota avoids 429 responses and their retries
+        self.rate_limiter = (
+            TokenBucket(requests_per_hour / 3600, burst) if requests_per_hour else None
+        )
+        
+        # Entries are effectively immutable per fdc_id, so memory entries
+        # don't expire and disk entries are kept for a month
+        self.cache = None
+        if cache:
+            shared = SQLiteCache(cache_path, ttl=30 * 86400) if cache_path else None
+            self.cache = TieredCache(LRUCache(maxsize=4096), shared)
+    
+    def _wait_for_rate_limit(self):
+        """Block until the rate limiter allows another request."""
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
     
     def search_foods(self, query: str, page_number: int = 1, 
                     page_size: int = 25, data_type: Optional[List[str]] = None) -> List[Dict]:
@@ -39,7 +298,7 @@ class USDAFoodDataAPI:
         Args:
             query: Search query (food name, keywords)
             page_number: Page number (starting from 1)
-            page_size: Results per page (max 200)
+            page_size: Results per page (max MAX_PAGE_SIZE)
             data_type: Optional list of data types to include:
                       ['Foundation', 'SR Legacy', 'Survey (FNDDS)', 'Branded']
             
@@ -51,32 +310,36 @@ class USDAFoodDataAPI:
             return []
         
         try:
-            url = f"{self.BASE_URL}/foods/search"
             params = {
                 'api_key': self.api_key,
                 'query': query,
                 'pageNumber': page_number,
-                'pageSize': min(page_size, 200)
+                'pageSize': min(page_size, self.MAX_PAGE_SIZE)
             }
             
             if data_type:
                 params['dataType'] = ','.join(data_type)
             
-            response = self.session.get(url, params=params, timeout=10)
+            self._wait_for_rate_limit()
+            response = self.session.get(self.SEARCH_URL, params=params, timeout=self.TIMEOUT)
             response.raise_for_status()
             
-            data = response.json()
+            data = _json.loads(response.content)
             return data.get('foods', [])
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error searching USDA foods for '{query}': {e}")
             return []
     
-    def get_food_by_id(self, fdc_id: int) -> Optional[Dict]:
+    @cached('usda:food')
+    def get_food_by_id(self, fdc_id: int,
+                       nutrients: Optional[Sequence[str]] = None) -> Optional[Dict]:
         """Get detailed food information by FDC ID.
         
         Args:
             fdc_id: USDA FoodData Central ID
+            nutrients: Optional nutrient numbers (up to 25) to limit
+                      `foodNutrients` to, shrinking the response
             
         Returns:
             Food dictionary with full details or None if not found
@@ -86,18 +349,22 @@ class USDAFoodDataAPI:
             return None
         
         try:
-            url = f"{self.BASE_URL}/food/{fdc_id}"
+            url = self.FOOD_URL.format(fdc_id)
             params = {'api_key': self.api_key}
+            if nutrients:
+                params['nutrients'] = ','.join(nutrients)
             
-            response = self.session.get(url, params=params, timeout=10)
+            self._wait_for_rate_limit()
+            response = self.session.get(url, params=params, timeout=self.TIMEOUT)
             response.raise_for_status()
             
-            return response.json()
+            return _json.loads(response.content)
             
-        except requests.RequestException as e:
+        except (requests.RequestException, ValueError) as e:
             logger.error(f"Error fetching USDA food ID {fdc_id}: {e}")
             return None
     
+    @cached('usda:nutrition')
     def get_nutrition_info(self, food_name: str) -> Optional[Dict]:
         """Get nutritional information for a food item.
         
@@ -120,38 +387,7 @@ class USDAFoodDataAPI:
         foods = self.search_foods(food_name, page_size=1)
         
         if foods:
-            food = foods[0]
-            
-            # Build nutrient dictionary for easy lookup
-            nutrients_dict = {}
-            for nutrient in food.get('foodNutrients', []):
-                name = nutrient.get('nutrientName', '')
-                value = nutrient.get('value', 0.0)
-                nutrients_dict[name] = value
-            
-            nutrition_info = {
-                'name': food.get('description', ''),
-                'brand': food.get('brandOwner', ''),
-                'fdc_id': food.get('fdcId'),
-                'data_type': food.get('dataType', ''),
-                
-                # Energy
-                'calories': nutrients_dict.get('Energy', 0.0),
-                
-                # Macronutrients
-                'protein': nutrients_dict.get('Protein', 0.0),
-                'carbs': nutrients_dict.get('Carbohydrate, by difference', 0.0),
-                'fats': nutrients_dict.get('Total lipid (fat)', 0.0),
-                'fiber': nutrients_dict.get('Fiber, total dietary', 0.0),
-                'sugars': nutrients_dict.get('Sugars, total including NLEA', 
-                                            nutrients_dict.get('Sugars, Total', 0.0)),
-                
-                # Other nutrients
-                'sodium': nutrients_dict.get('Sodium, Na', 0.0) / 1000,  # Convert mg to g
-                'cholesterol': nutrients_dict.get('Cholesterol', 0.0) / 1000,  # Convert mg to g
-                
-                'source': 'USDA FoodData Central'
-            }
+            nutrition_info = parse_nutrition_info(foods[0])
             
             logger.info(f"Found USDA nutrition info for '{food_name}': {nutrition_info['name']}")
             return nutrition_info
@@ -159,6 +395,82 @@ class USDAFoodDataAPI:
         logger.info(f"No USDA nutrition info found for '{food_name}'")
         return None
     
+    def get_foods_by_ids(self, fdc_ids: List[int],
+                         nutrients: Optional[Sequence[str]] = None) -> List[Dict]:
+        """Get full food records for several FDC IDs.
+        
+        IDs are sent FOODS_BATCH_SIZE at a time to the bulk /foods endpoint.
+        
+        Args:
+            fdc_ids: USDA FoodData Central IDs
+            nutrients: Optional nutrient numbers (up to 25) to limit
+                      `foodNutrients` to
+            
+        Returns:
+            List of food dictionaries for the IDs that were found
+        """
+        if not self.api_key:
+            logger.error("USDA API key required")
+            return []
+        
+        foods = []
+        for start in range(0, len(fdc_ids), self.FOODS_BATCH_SIZE):
+            batch = fdc_ids[start:start + self.FOODS_BATCH_SIZE]
+            payload = {'fdcIds': batch}
+            if nutrients:
+                payload['nutrients'] = [int(number) for number in nutrients]
+            
+            try:
+                self._wait_for_rate_limit()
+                response = self.session.post(self.FOODS_URL, params={'api_key': self.api_key},
+                                             json=payload, timeout=self.TIMEOUT)
+                response.raise_for_status()
+                foods.extend(_json.loads(response.content))
+            except (requests.RequestException, ValueError) as e:
+                logger.error(f"Error fetching USDA foods {batch}: {e}")
+        
+        return foods
+    
+    def get_nutrition_info_by_id(self, fdc_id: int) -> Optional[Dict]:
+        """Get nutritional information for a food with a known FDC ID.
+        
+        Only the nutrients in the result are requested, so the response is
+        a fraction of the full food record.
+        
+        Args:
+            fdc_id: USDA FoodData Central ID
+            
+        Returns:
+            Nutrition dictionary (see get_nutrition_info) or None if not found
+        """
+        food = self.get_food_by_id(fdc_id, nutrients=BASIC_NUTRIENT_NUMBERS)
+        return parse_nutrition_info(food) if food else None
+    
+    def get_nutrition_info_batch(self, food_names: List[str],
+                                 max_workers: int = 8) -> List[Optional[Dict]]:
+        """Get nutritional information for several food items concurrently.
+        
+        Lookups run on a thread pool sharing this client's connection pool,
+        and duplicate names are fetched only once.
+        
+        Args:
+            food_names: Names of the food items
+            max_workers: Maximum number of lookups in flight
+            
+        Returns:
+            List of nutrition dictionaries (see get_nutrition_info), or None
+            for foods that were not found, in the same order as food_names
+        """
+        unique_names = list(dict.fromkeys(food_names))
+        if not unique_names:
+            return []
+        
+        workers = min(max_workers, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            by_name = dict(zip(unique_names, executor.map(self.get_nutrition_info, unique_names)))
+        
+        return [by_name[name] for name in food_names]
+    
     def get_detailed_info(self, food_name: str) -> Optional[Dict]:
         """Get detailed nutritional information including all available nutrients.
         
@@ -172,76 +484,152 @@ class USDAFoodDataAPI:
         
         if foods:
             food = foods[0]
-            fdc_id = food.get('fdcId')
+            if _has_full_nutrients(food):
+                return parse_detailed_info(food)
             
             # Get full details
-            full_food = self.get_food_by_id(fdc_id)
+            full_food = self.get_food_by_id(food.get('fdcId'))
             if not full_food:
                 return None
             
-            # Build comprehensive nutrient dictionary
-            nutrients_dict = {}
-            for nutrient in full_food.get('foodNutrients', []):
-                name = nutrient.get('nutrient', {}).get('name', '')
-                value = nutrient.get('amount', 0.0)
-                unit = nutrient.get('nutrient', {}).get('unitName', '')
-                nutrients_dict[name] = {'value': value, 'unit': unit}
-            
-            detailed_info = {
-                'name': full_food.get('description', ''),
-                'brand': full_food.get('brandOwner', ''),
-                'fdc_id': fdc_id,
-                'data_type': full_food.get('dataType', ''),
-                'ingredients': full_food.get('ingredients', ''),
-                
-                # Macronutrients
-                'calories': self._get_nutrient_value(nutrients_dict, 'Energy'),
-                'protein': self._get_nutrient_value(nutrients_dict, 'Protein'),
-                'carbs': self._get_nutrient_value(nutrients_dict, 'Carbohydrate, by difference'),
-                'fats': self._get_nutrient_value(nutrients_dict, 'Total lipid (fat)'),
-                'fiber': self._get_nutrient_value(nutrients_dict, 'Fiber, total dietary'),
-                'sugars': self._get_nutrient_value(nutrients_dict, 'Sugars, total including NLEA'),
-                
-                # Fat breakdown
-                'saturated_fats': self._get_nutrient_value(nutrients_dict, 'Fatty acids, total saturated'),
-                'monounsaturated_fats': self._get_nutrient_value(nutrients_dict, 'Fatty acids, total monounsaturated'),
-                'polyunsaturated_fats': self._get_nutrient_value(nutrients_dict, 'Fatty acids, total polyunsaturated'),
-                'trans_fats': self._get_nutrient_value(nutrients_dict, 'Fatty acids, total trans'),
-                'cholesterol': self._get_nutrient_value(nutrients_dict, 'Cholesterol') / 1000,  # mg to g
-                
-                # Vitamins
-                'vitamin_a': self._get_nutrient_value(nutrients_dict, 'Vitamin A, RAE'),
-                'vitamin_c': self._get_nutrient_value(nutrients_dict, 'Vitamin C, total ascorbic acid'),
-                'vitamin_d': self._get_nutrient_value(nutrients_dict, 'Vitamin D (D2 + D3)'),
-                'vitamin_e': self._get_nutrient_value(nutrients_dict, 'Vitamin E (alpha-tocopherol)'),
-                'vitamin_k': self._get_nutrient_value(nutrients_dict, 'Vitamin K (phylloquinone)'),
-                'thiamin': self._get_nutrient_value(nutrients_dict, 'Thiamin'),
-                'riboflavin': self._get_nutrient_value(nutrients_dict, 'Riboflavin'),
-                'niacin': self._get_nutrient_value(nutrients_dict, 'Niacin'),
-                'vitamin_b6': self._get_nutrient_value(nutrients_dict, 'Vitamin B-6'),
-                'folate': self._get_nutrient_value(nutrients_dict, 'Folate, total'),
-                'vitamin_b12': self._get_nutrient_value(nutrients_dict, 'Vitamin B-12'),
-                
-                # Minerals
-                'calcium': self._get_nutrient_value(nutrients_dict, 'Calcium, Ca') / 1000,  # mg to g
-                'iron': self._get_nutrient_value(nutrients_dict, 'Iron, Fe') / 1000,
-                'magnesium': self._get_nutrient_value(nutrients_dict, 'Magnesium, Mg') / 1000,
-                'phosphorus': self._get_nutrient_value(nutrients_dict, 'Phosphorus, P') / 1000,
-                'potassium': self._get_nutrient_value(nutrients_dict, 'Potassium, K') / 1000,
-                'sodium': self._get_nutrient_value(nutrients_dict, 'Sodium, Na') / 1000,
-                'zinc': self._get_nutrient_value(nutrients_dict, 'Zinc, Zn') / 1000,
-                
-                'source': 'USDA FoodData Central'
-            }
-            
-            return detailed_info
+            return parse_detailed_info(full_food)
         
         return None
     
-    @staticmethod
-    def _get_nutrient_value(nutrients_dict: Dict, nutrient_name: str) -> float:
-        """Helper to safely extract nutrient value."""
-        nutrient = nutrients_dict.get(nutrient_name, {})
-        if isinstance(nutrient, dict):
-            return nutrient.get('value', 0.0)
-        return 0.0
+    def get_detailed_info_bulk(self, food_names: List[str],
+                               max_workers: int = 8) -> List[Optional[Dict]]:
+        """Get detailed nutritional information for several food items.
+        
+        Searches run concurrently, then the full records of all matches are
+        fetched with get_foods_by_ids(), so N foods take N searches plus
+        one request per FOODS_BATCH_SIZE foods instead of 2N requests.
+        
+        Args:
+            food_names: Names of the food items
+            max_workers: Maximum number of searches in flight
+            
+        Returns:
+            List of detailed nutrition dictionaries (see get_detailed_info),
+            or None for foods that were not found, in the same order as
+            food_names
+        """
+        full_foods = self._fetch_full_foods(food_names, max_workers)
+        by_name = {
+            name: parse_detailed_info(food) if food else None
+            for name, food in full_foods.items()
+        }
+        
+        return [by_name[name] for name in food_names]
+    
+    def get_detailed_info_records(self, food_names: List[str],
+                                  max_workers: int = 8) -> List[Optional[FoodNutrition]]:
+        """Get detailed nutritional information for several food items as records.
+        
+        Fetches like get_detailed_info_bulk(), but returns FoodNutrition
+        tuples instead of dictionaries, for bulk ingestion of many foods.
+        
+        Args:
+            food_names: Names of the food items
+            max_workers: Maximum number of searches in flight
+            
+        Returns:
+            List of FoodNutrition records, or None for foods that were not
+            found, in the same order as food_names
+        """
+        full_foods = self._fetch_full_foods(food_names, max_workers)
+        by_name = {
+            name: FoodNutrition.from_food(food) if food else None
+            for name, food in full_foods.items()
+        }
+        
+        return [by_name[name] for name in food_names]
+    
+    def get_detailed_info_bulk_df(self, food_names: List[str], max_workers: int = 8):
+        """Get detailed nutritional information for several food items as a DataFrame.
+        
+        Fetches like get_detailed_info_bulk(), but converts mg to g once
+        per column over float32 arrays instead of per value, which pays
+        off for hundreds of foods.
+        
+        Args:
+            food_names: Names of the food items
+            max_workers: Maximum number of searches in flight
+            
+        Returns:
+            pandas.DataFrame indexed by food name with the columns of
+            get_detailed_info; rows of foods that were not found are empty
+        """
+        # Imported here so the client doesn't pay pandas' import time
+        # unless a DataFrame is requested
+        import pandas as pd
+        
+        full_foods = self._fetch_full_foods(food_names, max_workers)
+        records = [
+            parse_detailed_info(full_foods[name], to_grams=False) if full_foods[name] else {}
+            for name in food_names
+        ]
+        
+        nutrients = [key for key, _ in DETAILED_NUTRITION_NUMBERS]
+        columns = ['name', 'brand', 'fdc_id', 'data_type', 'ingredients'] + nutrients + ['source']
+        df = pd.DataFrame.from_records(records, index=food_names, columns=columns)
+        df = df.astype(dict.fromkeys(nutrients, 'float32'))
+        
+        milligrams = [key for key in nutrients if key in MILLIGRAM_KEYS]
+        df[milligrams] /= 1000
+        return df
+    
+    def _fetch_full_foods(self, food_names: List[str], max_workers: int) -> Dict[str, Optional[Dict]]:
+        """Search each unique name and fetch the full records of the matches.
+        
+        Search results that already list all nutrients are used as they are.
+        
+        Returns:
+            Dictionary of food name to full food record, or None if not found
+        """
+        unique_names = list(dict.fromkeys(food_names))
+        if not unique_names:
+            return {}
+        
+        workers = min(max_workers, len(unique_names))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda name: self.search_foods(name, page_size=1), unique_names)
+            matches = {name: foods[0] for name, foods in zip(unique_names, results) if foods}
+        
+        missing_ids = [
+            food.get('fdcId') for food in matches.values() if not _has_full_nutrients(food)
+        ]
+        full_foods = {
+            food.get('fdcId'): food
+            for food in self.get_foods_by_ids(list(dict.fromkeys(missing_ids)))
+        }
+        
+        by_name = {}
+        for name in unique_names:
+            food = matches.get(name)
+            if food is not None and not _has_full_nutrients(food):
+                food = full_foods.get(food.get('fdcId'))
+            by_name[name] = food
+        return by_name
+
+
+def get_usda_client(api_key: Optional[str] = None) -> USDAFoodDataAPI:
+    """Return a shared USDAFoodDataAPI for api_key.
+    
+    Callers share one session, connection pool, cache and rate limiter
+    instead of each building their own.
+    
+    Args:
+        api_key: USDA API key (see USDAFoodDataAPI)
+        
+    Returns:
+        The client for api_key, created on first use
+    """
+    # Resolved before the lookup so that omitting the key and passing the
+    # USDA_API_KEY value explicitly share a client
+    return _get_usda_client(api_key or os.environ.get('USDA_API_KEY'))
+
+
+@lru_cache(maxsize=4)
+def _get_usda_client(api_key: Optional[str]) -> USDAFoodDataAPI:
+    """Create the client for get_usda_client, once per resolved key."""
+    return USDAFoodDataAPI(api_key)
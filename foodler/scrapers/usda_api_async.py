@@ -0,0 +1,310 @@
+"""Async USDA FoodData Central API client for high-fanout callers.
+
+Requires the optional aiohttp dependency. Responses are parsed with the
+same helpers as the synchronous USDAFoodDataAPI, so both return
+identical dictionaries.
+"""
+
+import asyncio
+import copy
+import random
+from typing import Optional, Dict, List, Sequence
+import logging
+import os
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+from . import _json
+from ._http import RETRY_STATUSES, TokenBucket, parse_retry_after
+from .usda_api import (
+    BASIC_NUTRIENT_NUMBERS, USDAFoodDataAPI, _warn_missing_api_key, parse_nutrition_info
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncUSDAFoodDataAPI:
+    """Async client for USDA FoodData Central API.
+    
+    Use as an async context manager so the connection pool is closed:
+    
+        async with AsyncUSDAFoodDataAPI() as usda:
+            results = await usda.get_nutrition_info_batch(names)
+    """
+    
+    BASE_URL = USDAFoodDataAPI.BASE_URL
+    SEARCH_URL = USDAFoodDataAPI.SEARCH_URL
+    FOOD_URL = USDAFoodDataAPI.FOOD_URL
+    TIMEOUT = USDAFoodDataAPI.TIMEOUT
+    MAX_PAGE_SIZE = USDAFoodDataAPI.MAX_PAGE_SIZE
+    
+    # Retries of connection errors, 429 and transient 5xx responses, with
+    # the same exponential backoff as the sync client's session
+    MAX_RETRIES = 5
+    BACKOFF_FACTOR = 1.0
+    
+    def __init__(self, api_key: Optional[str] = None, max_connections: int = 50,
+                 requests_per_hour: Optional[int] = 1000, burst: int = 30,
+                 hedge_delay: Optional[float] = None):
+        """Initialize the API client.
+        
+        Args:
+            api_key: USDA API key. If not provided, will try to read from
+                    USDA_API_KEY environment variable
+            max_connections: Maximum number of open connections
+            requests_per_hour: Client-side request rate limit, defaulting to
+                              the USDA quota per key; None disables it
+            burst: Requests that may start back-to-back after an idle period
+            hedge_delay: If set, seconds after which a request that hasn't
+                        completed is duplicated, using whichever response
+                        arrives first. Cuts tail latency for a few percent
+                        more requests.
+        """
+        if not AIOHTTP_AVAILABLE:
+            raise ImportError(
+                "aiohttp library is required. Install with: pip install aiohttp"
+            )
+        
+        self.api_key = api_key or os.environ.get('USDA_API_KEY')
+        if not self.api_key:
+            _warn_missing_api_key()
+        
+        self.max_connections = max_connections
+        self.hedge_delay = hedge_delay
+        # Requests in progress, keyed by URL and parameters, so concurrent
+        # identical lookups share one round-trip: [task, waiting callers]
+        self._inflight = {}
+        self.rate_limiter = (
+            TokenBucket(requests_per_hour / 3600, burst) if requests_per_hour else None
+        )
+        # Created on first use, since aiohttp sessions must be created
+        # inside a running event loop
+        self.session = None
+    
+    async def __aenter__(self):
+        self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """Return the client session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections, ttl_dns_cache=300),
+                timeout=aiohttp.ClientTimeout(total=self.TIMEOUT),
+                headers={
+                    'User-Agent': 'Foodler - Food Management App - v0.1.0',
+                    'Accept': 'application/json'
+                }
+            )
+        return self.session
+    
+    async def close(self):
+        """Close the client session and its connections."""
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+    
+    async def _get_json(self, url: str, params: Dict):
+        """GET url and decode the JSON response body.
+        
+        Concurrent calls for the same URL and parameters await a single
+        request instead of each sending their own. Each caller gets its own
+        copy of the result, so modifying it doesn't affect the others.
+        """
+        key = (url, tuple(sorted(params.items())))
+        flight = self._inflight.get(key)
+        if flight is None:
+            task = asyncio.ensure_future(self._hedged_get_json(url, params))
+            flight = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        flight[1] += 1
+        try:
+            # Shielded so a cancelled caller doesn't cancel the request for
+            # the other callers waiting on it
+            result = await asyncio.shield(flight[0])
+        finally:
+            flight[1] -= 1
+        # Callers resume one at a time; all but the last take a copy before
+        # anyone can modify the shared result
+        return copy.deepcopy(result) if flight[1] else result
+    
+    async def _hedged_get_json(self, url: str, params: Dict):
+        """GET url and decode the JSON response body, hedging if configured."""
+        if self.hedge_delay is None:
+            return await self._fetch_json(url, params)
+        
+        pending = {asyncio.ensure_future(self._fetch_json(url, params))}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=self.hedge_delay)
+            if not done:
+                # Slow response: race a duplicate request against it
+                pending.add(asyncio.ensure_future(self._fetch_json(url, params)))
+            
+            while True:
+                for task in done:
+                    # A failed request loses to one still in flight
+                    if task.exception() is None or not pending:
+                        return task.result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    async def _fetch_json(self, url: str, params: Dict):
+        """GET url and decode the JSON response body.
+        
+        Connection errors, 429 and transient 5xx responses are retried up to
+        MAX_RETRIES times with jittered exponential backoff. A Retry-After
+        header takes precedence over the backoff.
+        """
+        for attempt in range(self.MAX_RETRIES + 1):
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            
+            delay = None
+            try:
+                async with self._get_session().get(url, params=params) as response:
+                    if response.status not in RETRY_STATUSES or attempt == self.MAX_RETRIES:
+                        response.raise_for_status()
+                        return _json.loads(await response.read())
+                    delay = parse_retry_after(response.headers.get('Retry-After'))
+                    reason = f"HTTP {response.status}"
+            except aiohttp.ClientConnectionError as e:
+                if attempt == self.MAX_RETRIES:
+                    raise
+                reason = str(e)
+            
+            if delay is None:
+                delay = self.BACKOFF_FACTOR * 2 ** attempt + random.uniform(0, 1.0)
+            logger.debug(f"Retrying {url} in {delay:.1f}s after {reason}")
+            await asyncio.sleep(delay)
+    
+    async def search_foods(self, query: str, page_number: int = 1,
+                           page_size: int = 25, data_type: Optional[List[str]] = None) -> List[Dict]:
+        """Search for foods in the USDA database.
+        
+        Args:
+            query: Search query (food name, keywords)
+            page_number: Page number (starting from 1)
+            page_size: Results per page (max MAX_PAGE_SIZE)
+            data_type: Optional list of data types to include:
+                      ['Foundation', 'SR Legacy', 'Survey (FNDDS)', 'Branded']
+        
+        Returns:
+            List of food dictionaries
+        """
+        if not self.api_key:
+            logger.error("USDA API key required for search")
+            return []
+        
+        params = {
+            'api_key': self.api_key,
+            'query': query,
+            'pageNumber': page_number,
+            'pageSize': min(page_size, self.MAX_PAGE_SIZE)
+        }
+        if data_type:
+            params['dataType'] = ','.join(data_type)
+        
+        try:
+            data = await self._get_json(self.SEARCH_URL, params)
+            return data.get('foods', [])
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Error searching USDA foods for '{query}': {e}")
+            return []
+    
+    async def get_food_by_id(self, fdc_id: int,
+                             nutrients: Optional[Sequence[str]] = None) -> Optional[Dict]:
+        """Get detailed food information by FDC ID.
+        
+        Args:
+            fdc_id: USDA FoodData Central ID
+            nutrients: Optional nutrient numbers (up to 25) to limit
+                      `foodNutrients` to, shrinking the response
+        
+        Returns:
+            Food dictionary with full details or None if not found
+        """
+        if not self.api_key:
+            logger.error("USDA API key required")
+            return None
+        
+        params = {'api_key': self.api_key}
+        if nutrients:
+            params['nutrients'] = ','.join(nutrients)
+        
+        try:
+            return await self._get_json(self.FOOD_URL.format(fdc_id), params)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Error fetching USDA food ID {fdc_id}: {e}")
+            return None
+    
+    async def get_nutrition_info(self, food_name: str) -> Optional[Dict]:
+        """Get nutritional information for a food item.
+        
+        Args:
+            food_name: Name of the food item
+        
+        Returns:
+            Nutrition dictionary (see USDAFoodDataAPI.get_nutrition_info),
+            or None if food not found or API key missing
+        """
+        foods = await self.search_foods(food_name, page_size=1)
+        
+        if foods:
+            nutrition_info = parse_nutrition_info(foods[0])
+            
+            logger.info(f"Found USDA nutrition info for '{food_name}': {nutrition_info['name']}")
+            return nutrition_info
+        
+        logger.info(f"No USDA nutrition info found for '{food_name}'")
+        return None
+    
+    async def get_nutrition_info_by_id(self, fdc_id: int) -> Optional[Dict]:
+        """Get nutritional information for a food with a known FDC ID.
+        
+        Only the nutrients in the result are requested (see
+        USDAFoodDataAPI.get_nutrition_info_by_id).
+        
+        Args:
+            fdc_id: USDA FoodData Central ID
+        
+        Returns:
+            Nutrition dictionary or None if not found
+        """
+        food = await self.get_food_by_id(fdc_id, nutrients=BASIC_NUTRIENT_NUMBERS)
+        return parse_nutrition_info(food) if food else None
+    
+    async def get_nutrition_info_batch(self, food_names: List[str],
+                                       max_concurrency: int = 50) -> List[Optional[Dict]]:
+        """Get nutritional information for several food items concurrently.
+        
+        Duplicate names are fetched only once.
+        
+        Args:
+            food_names: Names of the food items
+            max_concurrency: Maximum number of lookups in flight
+        
+        Returns:
+            List of nutrition dictionaries, or None for foods that were not
+            found, in the same order as food_names
+        """
+        unique_names = list(dict.fromkeys(food_names))
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def lookup(name):
+            async with semaphore:
+                return await self.get_nutrition_info(name)
+        
+        results = await asyncio.gather(*(lookup(name) for name in unique_names))
+        by_name = dict(zip(unique_names, results))
+        
+        return [by_name[name] for name in food_names]
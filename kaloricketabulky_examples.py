@@ -5,7 +5,7 @@ WARNING: This scraper may violate kaloricketabulky.cz Terms of Service.
 Use at your own risk. Consider using Open Food Facts API instead.
 """
 
-from foodler.scrapers import KalorickeTabulkyScraper
+from foodler.scrapers import get_kt_scraper
 import json
 
 
@@ -13,7 +13,7 @@ def example_basic_search():
     """Example 1: Basic food search"""
     print("=== Example 1: Basic Food Search ===\n")
     
-    scraper = KalorickeTabulkyScraper(rate_limit_seconds=2.0)
+    scraper = get_kt_scraper(2.0)
     
     # Search for a food
     food_name = "kuřecí prsa"
@@ -38,7 +38,7 @@ def example_search_multiple():
     """Example 2: Search for multiple foods"""
     print("=== Example 2: Search Multiple Foods ===\n")
     
-    scraper = KalorickeTabulkyScraper(rate_limit_seconds=2.0)
+    scraper = get_kt_scraper(2.0)
     
     foods_to_search = ["banán", "jablko", "brambory"]
     
@@ -59,7 +59,7 @@ def example_scrape_category():
     """Example 3: Scrape a food category"""
     print("=== Example 3: Scrape Category ===\n")
     
-    scraper = KalorickeTabulkyScraper(rate_limit_seconds=2.0)
+    scraper = get_kt_scraper(2.0)
     
     # Scrape a category (limit to avoid too many requests)
     category = "ovoce"  # fruits
@@ -78,17 +78,13 @@ def example_export_data():
     """Example 4: Export scraped data"""
     print("=== Example 4: Export Data ===\n")
     
-    scraper = KalorickeTabulkyScraper(rate_limit_seconds=2.0)
+    scraper = get_kt_scraper(2.0)
     
-    # Search for multiple foods
+    # Look up multiple foods concurrently
     foods_to_scrape = ["kuřecí prsa", "rýže", "brokolice"]
-    all_foods = []
-    
-    for food_name in foods_to_scrape:
-        print(f"Scraping: {food_name}")
-        nutrition = scraper.get_nutrition_info(food_name)
-        if nutrition:
-            all_foods.append(nutrition)
+    print(f"Scraping: {', '.join(foods_to_scrape)}")
+    results = scraper.get_nutrition_info_batch(foods_to_scrape)
+    all_foods = [nutrition for nutrition in results if nutrition]
     
     print(f"\nScraped {len(all_foods)} foods")
     
@@ -110,7 +106,7 @@ def example_with_error_handling():
     print("=== Example 5: With Error Handling ===\n")
     
     try:
-        scraper = KalorickeTabulkyScraper(rate_limit_seconds=1.0)
+        scraper = get_kt_scraper(1.0)
         
         food_name = "neexistující potravina xyz123"
         print(f"Searching for: {food_name}")
@@ -139,7 +135,7 @@ def example_compare_with_openfoodfacts():
     
     # Try KalorickeTabulky (may have legal issues)
     print(f"Searching '{food_name}' in KalorickeTabulky.cz:")
-    kt_scraper = KalorickeTabulkyScraper(rate_limit_seconds=2.0)
+    kt_scraper = get_kt_scraper(2.0)
     kt_result = kt_scraper.get_nutrition_info(food_name)
     
     if kt_result:
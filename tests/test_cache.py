@@ -0,0 +1,108 @@
+"""Tests for the scraper caches and the cached decorator."""
+
+import threading
+import time
+
+from foodler.scrapers.cache import LRUCache, cached, normalize_key
+
+
+class Client:
+    """Minimal client counting calls to a cached lookup."""
+    
+    def __init__(self, result=None, cache=True):
+        self.cache = LRUCache() if cache else None
+        self.result = result if result is not None else {'name': 'milk', 'tags': ['dairy']}
+        self.calls = 0
+    
+    @cached('test:lookup')
+    def lookup(self, query, limit=10):
+        self.calls += 1
+        return self.result
+
+
+def test_normalize_key_keeps_diacritics():
+    assert normalize_key('  Kuřecí   Prsa ') == 'kuřecí prsa'
+    assert normalize_key('Kuřecí') != normalize_key('Kureci')
+
+
+def test_equivalent_arguments_share_a_key():
+    client = Client()
+    
+    client.lookup('Milk')
+    client.lookup('  milk ', 10)
+    client.lookup(query='MILK', limit=10)
+    
+    assert client.calls == 1
+
+
+def test_different_arguments_use_different_keys():
+    client = Client()
+    
+    client.lookup('milk')
+    client.lookup('milk', limit=5)
+    client.lookup('mléko')
+    
+    assert client.calls == 3
+
+
+def test_empty_results_are_not_cached():
+    client = Client(result=[])
+    
+    client.lookup('milk')
+    client.lookup('milk')
+    
+    assert client.calls == 2
+
+
+def test_without_cache_calls_through():
+    client = Client(cache=False)
+    
+    client.lookup('milk')
+    client.lookup('milk')
+    
+    assert client.calls == 2
+
+
+def test_callers_get_their_own_copy():
+    client = Client()
+    
+    first = client.lookup('milk')
+    first['name'] = 'changed'
+    first['tags'].append('changed')
+    second = client.lookup('milk')
+    second['tags'].clear()
+    third = client.lookup('milk')
+    
+    assert client.calls == 1
+    assert third == {'name': 'milk', 'tags': ['dairy']}
+
+
+def test_concurrent_calls_are_coalesced_into_copies():
+    started = threading.Event()
+    
+    class SlowClient(Client):
+        @cached('test:slow')
+        def lookup(self, query, limit=10):
+            self.calls += 1
+            started.set()
+            time.sleep(0.1)
+            return {'name': query, 'tags': []}
+    
+    client = SlowClient()
+    results = [None] * 4
+    
+    def run(index):
+        results[index] = client.lookup('milk')
+    
+    threads = [threading.Thread(target=run, args=(0,))]
+    threads[0].start()
+    started.wait()
+    threads += [threading.Thread(target=run, args=(i,)) for i in range(1, 4)]
+    for thread in threads[1:]:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    assert client.calls == 1
+    assert all(result == {'name': 'milk', 'tags': []} for result in results)
+    assert len({id(result) for result in results}) == len(results)
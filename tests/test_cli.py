@@ -0,0 +1,70 @@
+"""Tests for the command line interface."""
+
+import pytest
+from click.testing import CliRunner
+
+from foodler.cli import cli
+from foodler.database import FridgeDatabase
+
+
+@pytest.fixture
+def runner(tmp_path, monkeypatch):
+    """CliRunner working in an empty directory, so fridge.db is created there."""
+    monkeypatch.chdir(tmp_path)
+    return CliRunner()
+
+
+def _write_csv(content, encoding='utf-8'):
+    with open('items.csv', 'w', encoding=encoding) as f:
+        f.write(content)
+    return 'items.csv'
+
+
+def _fridge_names():
+    with FridgeDatabase() as db:
+        return sorted(item.name for item in db.get_all_items())
+
+
+def test_fridge_import_adds_all_rows(runner):
+    path = _write_csv(
+        "name,quantity,unit,calories\n"
+        "Mléko,1,l,42\n"
+        " eggs ,10,pieces,\n"
+    )
+    
+    result = runner.invoke(cli, ['fridge', 'import', path])
+    
+    assert result.exit_code == 0, result.output
+    assert "Imported 2 items" in result.output
+    assert _fridge_names() == ['Mléko', 'eggs']
+
+
+def test_fridge_import_accepts_excel_bom(runner):
+    path = _write_csv("name,quantity,unit\nMléko,1,l\n", encoding='utf-8-sig')
+    
+    result = runner.invoke(cli, ['fridge', 'import', path])
+    
+    assert result.exit_code == 0, result.output
+    assert _fridge_names() == ['Mléko']
+
+
+@pytest.mark.parametrize('content, error', [
+    ("name,quantity,unit\nmilk,1,l\neggs,ten,pieces\n", "line 3"),
+    ("name,quantity\nmilk,1\n", "line 2"),
+    ("name,quantity,unit,calories\nmilk,1,l,lots\n", "line 2"),
+])
+def test_fridge_import_rejects_invalid_rows(runner, content, error):
+    path = _write_csv(content)
+    
+    result = runner.invoke(cli, ['fridge', 'import', path])
+    
+    assert result.exit_code == 1
+    assert f"Invalid row on {error}" in result.output
+    # Nothing is imported when any row is invalid
+    assert _fridge_names() == []
+
+
+def test_fridge_import_requires_existing_file(runner):
+    result = runner.invoke(cli, ['fridge', 'import', 'missing.csv'])
+    
+    assert result.exit_code == 2
@@ -0,0 +1,154 @@
+"""Tests for the fridge inventory database."""
+
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from foodler.database import FridgeDatabase
+from foodler.database.fridge_db import FoodItem
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = FridgeDatabase(str(tmp_path / 'fridge.db'))
+    yield database
+    database.close()
+
+
+def _set_usage(db, name, meals_without=0, days_ago=None, meal_number=None):
+    """Set the usage counters of the item called name."""
+    item = db.session.query(FoodItem).filter(FoodItem.name == name).one()
+    item.meals_without = meals_without
+    if days_ago is not None:
+        item.last_used_meal_date = date.today() - timedelta(days=days_ago)
+    item.last_used_meal_number = meal_number
+    db.session.commit()
+
+
+def test_add_items_inserts_all_rows(db):
+    count = db.add_items([
+        {'name': 'milk', 'quantity': 1, 'unit': 'l', 'calories': 42},
+        {'name': 'eggs', 'quantity': 10, 'unit': 'pieces'},
+    ])
+    
+    assert count == 2
+    items = {item.name: item for item in db.get_all_items()}
+    assert items['milk'].calories == 42
+    assert items['eggs'].calories is None
+    assert all(item.meals_without == 0 for item in items.values())
+
+
+def test_add_items_with_no_rows(db):
+    assert db.add_items([]) == 0
+    assert db.get_all_items() == []
+
+
+def test_get_item_by_name_matches_substrings(db):
+    db.add_items([
+        {'name': 'Kuřecí prsa', 'quantity': 0.5, 'unit': 'kg'},
+        {'name': 'Kuřecí stehna', 'quantity': 1, 'unit': 'kg'},
+        {'name': 'Mléko', 'quantity': 1, 'unit': 'l'},
+    ])
+    
+    assert ({item.name for item in db.get_item_by_name('Kuřecí')}
+            == {'Kuřecí prsa', 'Kuřecí stehna'})
+    assert [item.name for item in db.get_item_by_name('prsa')] == ['Kuřecí prsa']
+    # Too short for the trigram index, answered by LIKE instead
+    assert [item.name for item in db.get_item_by_name('Ml')] == ['Mléko']
+    assert db.get_item_by_name('"quoted"') == []
+
+
+def test_get_item_by_name_follows_renames_and_deletes(db):
+    item = db.add_item('yoghurt', 2, 'pieces')
+    
+    item.name = 'greek yoghurt'
+    db.session.commit()
+    assert [found.id for found in db.get_item_by_name('greek')] == [item.id]
+    
+    db.delete_item(item.id)
+    assert db.get_item_by_name('yoghurt') == []
+
+
+def test_items_to_use_follow_the_usage_cycle(db):
+    db.add_items([{'name': name, 'quantity': 1, 'unit': 'pieces'}
+                  for name in ('apple', 'bread', 'carrot', 'dates', 'eggs', 'fish')])
+    _set_usage(db, 'apple', meals_without=1, days_ago=1, meal_number=2)
+    _set_usage(db, 'bread', meals_without=3, days_ago=2, meal_number=1)
+    _set_usage(db, 'carrot', meals_without=1, days_ago=1, meal_number=1)
+    _set_usage(db, 'dates', meals_without=1)
+    _set_usage(db, 'eggs', meals_without=1, days_ago=3, meal_number=3)
+    _set_usage(db, 'fish', meals_without=1, days_ago=1, meal_number=1)
+    
+    expected = ['bread', 'dates', 'eggs', 'carrot', 'fish', 'apple']
+    assert [item.name for item in db.get_items_to_use()] == expected
+    assert [row.name for row in db.get_items_to_use_lite()] == expected
+    assert [row.name for row in db.get_items_to_use_lite(limit=2)] == expected[:2]
+
+
+def test_ties_are_ordered_by_name(db):
+    # Inserted out of alphabetical order, so rowid order differs
+    db.add_items([{'name': name, 'quantity': 1, 'unit': 'kg'}
+                  for name in ('zucchini', 'apple', 'milk')])
+    
+    assert [item.name for item in db.get_items_to_use()] == ['apple', 'milk', 'zucchini']
+    assert [row.name for row in db.get_items_to_use_lite()] == ['apple', 'milk', 'zucchini']
+
+
+def test_meal_counters(db):
+    db.add_items([{'name': name, 'quantity': 1, 'unit': 'kg'}
+                  for name in ('apple', 'bread', 'carrot')])
+    ids = {item.name: item.id for item in db.get_all_items()}
+    
+    db.increment_meals_without(exclude_ids=[ids['apple']])
+    db.increment_meals_without()
+    assert db.mark_many_as_used([ids['bread']], meal_number=2) == 1
+    
+    items = {item.name: item for item in db.get_all_items()}
+    assert items['apple'].meals_without == 1
+    assert items['bread'].meals_without == 0
+    assert items['bread'].last_used_meal_date == date.today()
+    assert items['bread'].last_used_meal_number == 2
+    assert items['carrot'].meals_without == 2
+    assert [row.name for row in db.get_items_to_use_lite()] == ['carrot', 'apple', 'bread']
+
+
+def test_relative_paths_resolve_against_the_current_directory(tmp_path, monkeypatch):
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    first.mkdir()
+    second.mkdir()
+    
+    monkeypatch.chdir(first)
+    with FridgeDatabase('fridge.db') as db:
+        db.add_item('milk', 1, 'l')
+    with FridgeDatabase(str(first / 'fridge.db')) as db:
+        assert [item.name for item in db.get_all_items()] == ['milk']
+    
+    monkeypatch.chdir(second)
+    with FridgeDatabase('fridge.db') as db:
+        assert db.get_all_items() == []
+        assert [item.name for item in db.get_item_by_name('egg')] == []
+    assert (second / 'fridge.db').exists()
+
+
+
+def test_close_does_not_run_statements(tmp_path):
+    path = str(tmp_path / 'fridge.db')
+    with FridgeDatabase(path) as db:
+        db.add_item('milk', 1, 'l')
+    
+    statements = []
+    
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db.engine
+    db = FridgeDatabase(path)
+    db.get_all_items()
+    event.listen(engine, 'before_cursor_execute', on_execute)
+    try:
+        db.close()
+    finally:
+        event.remove(engine, 'before_cursor_execute', on_execute)
+    
+    assert statements == []
@@ -0,0 +1,146 @@
+"""Tests for the kaloricketabulky.cz HTML parsing."""
+
+from pathlib import Path
+
+import pytest
+import requests
+
+from foodler.scrapers.kaloricketabulky_scraper import (
+    KalorickeTabulkyScraper, _find, _find_all, _parse_html, get_kt_scraper
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def _response(body: bytes, content_type: str = 'text/html') -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response._content_consumed = True
+    response.headers['Content-Type'] = content_type
+    return response
+
+
+def _fixture_tree(name):
+    body = (FIXTURES / name).read_bytes()
+    return _parse_html(_response(body, 'text/html; charset=utf-8'))
+
+
+def test_parse_html_with_xml_declaration_and_no_charset_header():
+    body = ('<?xml version="1.0" encoding="windows-1250"?>\n'
+            '<html><body><h1 class="title">Kuřecí prsa</h1></body></html>').encode('cp1250')
+    
+    tree = _parse_html(_response(body))
+    
+    assert _find(tree, 'h1.title').text_content() == 'Kuřecí prsa'
+
+
+def test_parse_html_without_charset_header():
+    body = '<html><body><p id="name">Žluťoučký kůň</p></body></html>'.encode('utf-8')
+    
+    tree = _parse_html(_response(body))
+    
+    assert _find(tree, 'p#name').text_content() == 'Žluťoučký kůň'
+
+
+def test_parse_html_with_charset_header():
+    body = '<html><body><p id="name">Mléko</p></body></html>'.encode('cp1250')
+    
+    tree = _parse_html(_response(body, 'text/html; charset=windows-1250'))
+    
+    assert _find(tree, 'p#name').text_content() == 'Mléko'
+
+
+def test_get_kt_scraper_shares_one_scraper_per_rate_limit():
+    scraper = get_kt_scraper()
+    
+    assert get_kt_scraper(1) is scraper
+    assert get_kt_scraper(rate_limit_seconds=1.0) is scraper
+    assert get_kt_scraper(2.0) is not scraper
+
+
+def test_retry_delay_honors_retry_after_up_to_the_cap():
+    scraper = KalorickeTabulkyScraper(cache=False, http_cache=None)
+    response = _response(b'')
+    
+    response.headers['Retry-After'] = '7'
+    assert scraper._retry_delay(response, attempt=0) == 7.0
+    
+    response.headers['Retry-After'] = '3600'
+    assert scraper._retry_delay(response, attempt=0) == scraper.BACKOFF_CAP
+    
+    del response.headers['Retry-After']
+    assert 0 <= scraper._retry_delay(response, attempt=2) <= scraper.BACKOFF_BASE * 4
+
+
+def test_throttling_slows_the_rate_limiter_until_requests_succeed():
+    scraper = KalorickeTabulkyScraper(rate_limit_seconds=0.5, cache=False, http_cache=None)
+    
+    scraper._adjust_interval(throttled=True)
+    assert scraper.rate_limiter.rate == pytest.approx(1.0)
+    
+    for _ in range(20):
+        scraper._adjust_interval(throttled=False)
+    assert scraper.rate_limiter.rate == pytest.approx(2.0)
+
+
+def test_zero_rate_limit_disables_the_rate_limiter():
+    scraper = KalorickeTabulkyScraper(rate_limit_seconds=0, cache=False, http_cache=None)
+    
+    assert scraper.rate_limiter is None
+    scraper._adjust_interval(throttled=True)
+
+
+def test_selectors_match_whole_class_names():
+    tree = _fixture_tree('kt_search.html')
+    
+    items = _find_all(tree, 'div.food-item')
+    
+    assert len(items) == 3
+    assert _find(items[0], 'span.protein').text_content() == '23,5 g'
+    assert _find(tree, 'div#missing') is None
+
+
+def test_search_results_are_parsed():
+    scraper = KalorickeTabulkyScraper(cache=False, http_cache=None)
+    items = _find_all(_fixture_tree('kt_search.html'), 'div.food-item')
+    
+    foods = [scraper._parse_food_item(item) for item in items]
+    
+    assert foods[0] == {
+        'name': 'Kuřecí prsa',
+        'food_id': '1021',
+        'calories': 110.0,
+        'protein': 23.5,
+        'carbs': 0.0,
+        'fats': 1.5,
+        'source': 'kaloricketabulky.cz',
+    }
+    # ID taken from the link when the element has no data attribute
+    assert foods[1]['food_id'] == '2048'
+    assert foods[1]['protein'] == 0.0
+    # Items without a name are skipped
+    assert foods[2] is None
+
+
+def test_nutrition_table_is_parsed():
+    scraper = KalorickeTabulkyScraper(cache=False, http_cache=None)
+    
+    nutrition = scraper._parse_nutrition_table(_fixture_tree('kt_detail.html'))
+    
+    assert nutrition == {
+        'name': 'Kuřecí prsa',
+        'calories': 110.0,
+        'protein': 23.5,
+        'carbs': 0.0,
+        'fats': 1.5,
+        'fiber': 0.0,
+        'sugars': 0.2,
+        'salt': 0.13,
+    }
+
+
+def test_page_without_nutrition_table():
+    scraper = KalorickeTabulkyScraper(cache=False, http_cache=None)
+    
+    assert scraper._parse_nutrition_table(_fixture_tree('kt_search.html')) is None
@@ -0,0 +1,100 @@
+"""Tests for the nutrition calculator."""
+
+import pytest
+
+import foodler.calculator.nutrition_calculator as nutrition_calculator
+from foodler.calculator import NutritionCalculator
+
+MEALS = [
+    [
+        {'name': 'rice', 'quantity': 150, 'calories': 130, 'protein': 2.7, 'carbs': 28, 'fats': 0.3},
+        {'name': 'chicken', 'quantity': 120, 'calories': 165, 'protein': 31, 'carbs': 0, 'fats': 3.6},
+    ],
+    [
+        {'name': 'bread', 'quantity': 80, 'calories': 265, 'protein': 9, 'carbs': 49, 'fats': 3.2},
+        {'name': 'cheese', 'quantity': 33.3, 'calories': 402, 'protein': 25, 'carbs': 1.3, 'fats': 33},
+        {'name': 'apple', 'quantity': 182, 'calories': 52, 'protein': 0.3, 'carbs': 14, 'fats': 0.2},
+    ],
+    [
+        {'name': 'oats', 'quantity': 90, 'calories': 389, 'protein': 16.9, 'carbs': 66.3, 'fats': 6.9},
+        {'name': 'milk', 'quantity': 250, 'calories': 42, 'protein': 3.4, 'carbs': 5, 'fats': 1},
+    ],
+    [],
+]
+
+requires_numpy = pytest.mark.skipif(
+    not nutrition_calculator.NUMPY_AVAILABLE, reason="NumPy is not installed"
+)
+
+
+@pytest.fixture(params=[True, False], ids=['numpy', 'pure'])
+def use_numpy(request, monkeypatch):
+    """Run a test with both the NumPy and the pure Python implementation."""
+    if request.param and not nutrition_calculator.NUMPY_AVAILABLE:
+        pytest.skip("NumPy is not installed")
+    monkeypatch.setattr(nutrition_calculator, 'NUMPY_AVAILABLE', request.param)
+    return request.param
+
+
+def _balance(meal, numpy):
+    original = nutrition_calculator.NUMPY_AVAILABLE
+    nutrition_calculator.NUMPY_AVAILABLE = numpy
+    try:
+        calculator = NutritionCalculator()
+        return calculator.calculate_meal_balance(meal), calculator.is_meal_balanced(meal)
+    finally:
+        nutrition_calculator.NUMPY_AVAILABLE = original
+
+
+@requires_numpy
+@pytest.mark.parametrize('meal', MEALS)
+def test_numpy_and_pure_paths_agree(meal):
+    fast, fast_balanced = _balance(meal, numpy=True)
+    pure, pure_balanced = _balance(meal, numpy=False)
+    
+    # float32 may differ from float64 in the last rounded digit
+    assert fast['totals'] == pytest.approx(pure['totals'], abs=0.011)
+    assert fast['percentages'] == pytest.approx(pure['percentages'], abs=0.011)
+    assert fast['daily_needs'] == pure['daily_needs']
+    assert fast['is_balanced'] == pure['is_balanced'] == fast_balanced == pure_balanced
+
+
+def test_totals_are_rounded_to_two_decimals(use_numpy):
+    result = NutritionCalculator().calculate_meal_balance(MEALS[1])
+    
+    for value in list(result['totals'].values()) + list(result['percentages'].values()):
+        assert isinstance(value, float)
+        assert value == round(value, 2)
+
+
+def test_in_place_needs_change_is_picked_up(use_numpy):
+    calculator = NutritionCalculator()
+    before = calculator.calculate_meal_balance(MEALS[0])['percentages']['calories']
+    
+    calculator.daily_needs['calories'] = 1000
+    after = calculator.calculate_meal_balance(MEALS[0])
+    
+    assert after['percentages']['calories'] == pytest.approx(before * 2, abs=0.02)
+    assert after['daily_needs']['calories'] == 1000
+
+
+def test_zero_need_counts_as_one(use_numpy):
+    calculator = NutritionCalculator()
+    calculator.daily_needs['fats'] = 0
+    
+    result = calculator.calculate_meal_balance(MEALS[0])
+    
+    assert result['percentages']['fats'] == pytest.approx(result['totals']['fats'] * 100, abs=0.02)
+    assert calculator.is_meal_balanced(MEALS[0]) is False
+
+
+def test_results_are_copies(use_numpy):
+    calculator = NutritionCalculator()
+    result = calculator.calculate_meal_balance(MEALS[0])
+    
+    result['totals']['calories'] = -1
+    result['daily_needs']['calories'] = -1
+    
+    again = calculator.calculate_meal_balance(MEALS[0])
+    assert again['totals']['calories'] > 0
+    assert calculator.daily_needs['calories'] == 2000
@@ -0,0 +1,74 @@
+"""Tests for parsing USDA FoodData Central responses."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from foodler.scrapers.usda_api import (
+    FoodNutrition, parse_detailed_info, parse_nutrition_info
+)
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+def _load(name):
+    with open(FIXTURES / name, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_parse_nutrition_info_from_search_result():
+    info = parse_nutrition_info(_load('usda_search_result.json'))
+    
+    assert info == {
+        'name': 'Chicken, broilers or fryers, breast, meat only, raw',
+        'brand': None,
+        'fdc_id': 171077,
+        'data_type': 'SR Legacy',
+        'calories': 120,
+        'protein': 22.5,
+        'carbs': 0,
+        'fats': 2.62,
+        'fiber': 0.0,
+        'sugars': 0.0,
+        'sodium': pytest.approx(0.045),
+        'cholesterol': pytest.approx(0.073),
+        'source': 'USDA FoodData Central',
+    }
+
+
+def test_parse_detailed_info_from_food_record():
+    info = parse_detailed_info(_load('usda_food_record.json'))
+    
+    assert info['name'] == 'Apples, fuji, with skin, raw'
+    assert info['fdc_id'] == 1750340
+    # Energy by nutrient number, not the Atwater variant listed first
+    assert info['calories'] == 63
+    assert info['protein'] == 0.148
+    assert info['carbs'] == 15.7
+    # Foundation foods report total sugars as 269.3
+    assert info['sugars'] == 13.3
+    # Explicit nulls and missing nutrients are zero
+    assert info['fiber'] == 0.0
+    assert info['sodium'] == 0.0
+    assert info['iron'] == 0.0
+    assert info['calcium'] == pytest.approx(0.006)
+
+
+def test_parse_detailed_info_can_keep_milligrams():
+    info = parse_detailed_info(_load('usda_food_record.json'), to_grams=False)
+    
+    assert info['calcium'] == 6
+
+
+def test_food_nutrition_record_matches_detailed_info():
+    food = _load('usda_food_record.json')
+    
+    assert FoodNutrition.from_food(food).to_dict() == parse_detailed_info(food)
+
+
+def test_food_without_nutrients():
+    info = parse_nutrition_info({'description': 'Water', 'fdcId': 1})
+    
+    assert info['calories'] == 0.0
+    assert info['sodium'] == 0.0
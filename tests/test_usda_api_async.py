@@ -0,0 +1,61 @@
+"""Tests for request coalescing in the async USDA client."""
+
+import asyncio
+
+from foodler.scrapers.usda_api_async import AsyncUSDAFoodDataAPI
+
+
+def _client(response):
+    """Client whose requests return copies of response after a short delay.
+    
+    Built without __init__, which needs aiohttp; coalescing doesn't.
+    """
+    client = AsyncUSDAFoodDataAPI.__new__(AsyncUSDAFoodDataAPI)
+    client._inflight = {}
+    client.requests = 0
+    
+    async def fetch(url, params):
+        client.requests += 1
+        await asyncio.sleep(0.01)
+        return {'foods': [dict(food) for food in response['foods']]}
+    
+    client._hedged_get_json = fetch
+    return client
+
+
+def test_concurrent_identical_requests_are_coalesced_into_copies():
+    client = _client({'foods': [{'description': 'Milk'}]})
+    
+    async def caller():
+        result = await client._get_json('https://example.test', {'query': 'milk'})
+        # Modifying a result must not affect the other callers
+        result['foods'][0]['description'] = 'changed'
+        result['foods'].append({})
+        return result
+    
+    async def main():
+        first = asyncio.ensure_future(caller())
+        await asyncio.sleep(0)
+        unchanged = await client._get_json('https://example.test', {'query': 'milk'})
+        return await first, unchanged
+    
+    first, unchanged = asyncio.run(main())
+    
+    assert client.requests == 1
+    assert len(first['foods']) == 2
+    assert unchanged == {'foods': [{'description': 'Milk'}]}
+    assert client._inflight == {}
+
+
+def test_different_requests_are_not_coalesced():
+    client = _client({'foods': []})
+    
+    async def main():
+        await asyncio.gather(
+            client._get_json('https://example.test', {'query': 'milk'}),
+            client._get_json('https://example.test', {'query': 'eggs'}),
+        )
+    
+    asyncio.run(main())
+    
+    assert client.requests == 2